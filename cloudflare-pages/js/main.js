@@ -126,7 +126,8 @@ async function handleFileUpload(file) {
             const imagePreview = document.getElementById('imagePreview');
             const previewImage = document.getElementById('previewImage');
             
-            previewImage.src = `${API_BASE_URL}${data.url}`;
+            // 后端配置了CDN时返回完整URL，否则为相对路径
+            previewImage.src = data.url.startsWith('/') ? `${API_BASE_URL}${data.url}` : data.url;
             imagePreview.style.display = 'block';
             
             // 隐藏上传区域
@@ -2,56 +2,54 @@
 核心模块包
 
 包含颜色分析和款式识别等核心功能。
+
+子模块按需导入：访问某个导出名称时才加载对应模块，
+只用到颜色分析或规则引擎时不会导入TensorFlow。
 """
 
-from .color_analyzer import (
-    extract_dominant_colors,
-    classify_color_type,
-    evaluate_color_combo
-)
-
-from .style_recognizer import (
-    StyleRecognizer,
-    create_recognizer,
-    CLASS_NAMES,
-    NUM_CLASSES,
-    IMG_SIZE
-)
-
-from .rule_engine import (
-    RuleEvaluator,
-    RuleLibrary,
-    BaseRule,
-    ColorRule,
-    StyleRule,
-    ContextRule,
-    RuleResult,
-    RuleSeverity,
-    create_evaluator,
-    evaluate_outfit
-)
-
-__all__ = [
+import importlib
+
+# 导出名称 -> 所在子模块
+_EXPORTS = {
     # 颜色分析
-    'extract_dominant_colors',
-    'classify_color_type',
-    'evaluate_color_combo',
+    'Palette': 'color_analyzer',
+    'extract_palette': 'color_analyzer',
+    'extract_dominant_colors': 'color_analyzer',
+    'palette_to_list': 'color_analyzer',
+    'classify_color_type': 'color_analyzer',
+    'classify_color_types_batch': 'color_analyzer',
+    'evaluate_color_combo': 'color_analyzer',
     # 款式识别
-    'StyleRecognizer',
-    'create_recognizer',
-    'CLASS_NAMES',
-    'NUM_CLASSES',
-    'IMG_SIZE',
+    'StyleRecognizer': 'style_recognizer',
+    'create_recognizer': 'style_recognizer',
+    'CLASS_NAMES': 'style_recognizer',
+    'NUM_CLASSES': 'style_recognizer',
+    'IMG_SIZE': 'style_recognizer',
     # 规则引擎
-    'RuleEvaluator',
-    'RuleLibrary',
-    'BaseRule',
-    'ColorRule',
-    'StyleRule',
-    'ContextRule',
-    'RuleResult',
-    'RuleSeverity',
-    'create_evaluator',
-    'evaluate_outfit',
-]
+    'RuleEvaluator': 'rule_engine',
+    'RuleLibrary': 'rule_engine',
+    'BaseRule': 'rule_engine',
+    'ColorRule': 'rule_engine',
+    'StyleRule': 'rule_engine',
+    'ContextRule': 'rule_engine',
+    'RuleResult': 'rule_engine',
+    'RuleSeverity': 'rule_engine',
+    'create_evaluator': 'rule_engine',
+    'evaluate_outfit': 'rule_engine',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # 缓存到包命名空间，后续访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
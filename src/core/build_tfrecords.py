@@ -0,0 +1,129 @@
+"""
+TFRecord构建脚本
+
+将按类别子目录组织的图像数据集转换为分片的TFRecord文件。
+训练时从少量大文件顺序读取，代替逐个打开成千上万张小图片，减少文件I/O开销。
+
+每条记录保存原始图像字节（不重新编码）和类别下标：
+    image/encoded      原始JPEG/PNG字节
+    image/class/label  类别下标（按子目录名排序，与image_dataset_from_directory一致）
+
+使用方法:
+    python src/core/build_tfrecords.py --train_dir data/train --validation_dir data/validation --output_dir data/tfrecords
+"""
+
+import os
+import math
+import argparse
+import random
+import tensorflow as tf
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif'}
+
+
+def list_labeled_images(data_dir: str) -> tuple:
+    """
+    列出数据目录中的图像及其类别下标
+    
+    参数:
+        data_dir: 数据目录路径（每个类别一个子目录）
+    
+    返回:
+        tuple: (类别名称列表, [(图像路径, 类别下标), ...])
+    """
+    class_names = sorted(
+        entry.name for entry in os.scandir(data_dir) if entry.is_dir()
+    )
+    
+    samples = []
+    for label, class_name in enumerate(class_names):
+        for root, _, files in os.walk(os.path.join(data_dir, class_name)):
+            for file in sorted(files):
+                if os.path.splitext(file)[1].lower() in IMAGE_EXTENSIONS:
+                    samples.append((os.path.join(root, file), label))
+    
+    return class_names, samples
+
+
+def _make_example(image_bytes: bytes, label: int) -> tf.train.Example:
+    """将一张图像编码为tf.train.Example"""
+    return tf.train.Example(features=tf.train.Features(feature={
+        'image/encoded': tf.train.Feature(bytes_list=tf.train.BytesList(value=[image_bytes])),
+        'image/class/label': tf.train.Feature(int64_list=tf.train.Int64List(value=[label])),
+    }))
+
+
+def write_tfrecords(data_dir: str,
+                    output_dir: str,
+                    split: str,
+                    shard_size_mb: int = 200,
+                    seed: int = 42) -> list:
+    """
+    将一个数据目录写成分片TFRecord文件
+    
+    参数:
+        data_dir: 数据目录路径（每个类别一个子目录）
+        output_dir: 输出目录
+        split: 数据集名称，用作文件名前缀（如 train、validation）
+        shard_size_mb: 每个分片的目标大小（MB）
+        seed: 打乱样本顺序的随机种子，使每个分片都包含各个类别
+    
+    返回:
+        list: 写出的分片文件路径列表
+    
+    异常:
+        ValueError: 数据目录中没有图像时抛出
+    """
+    class_names, samples = list_labeled_images(data_dir)
+    if not samples:
+        raise ValueError(f"在 {data_dir} 中未找到图像")
+    
+    random.Random(seed).shuffle(samples)
+    
+    # 按文件总大小估算分片数
+    total_bytes = sum(os.path.getsize(path) for path, _ in samples)
+    num_shards = math.ceil(total_bytes / (shard_size_mb * 1024 * 1024))
+    num_shards = min(max(num_shards, 1), len(samples))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    shard_paths = []
+    
+    for shard in range(num_shards):
+        shard_path = os.path.join(
+            output_dir, f'{split}-{shard:05d}-of-{num_shards:05d}.tfrecord'
+        )
+        with tf.io.TFRecordWriter(shard_path) as writer:
+            start = shard * len(samples) // num_shards
+            end = (shard + 1) * len(samples) // num_shards
+            for path, label in samples[start:end]:
+                with open(path, 'rb') as f:
+                    writer.write(_make_example(f.read(), label).SerializeToString())
+        shard_paths.append(shard_path)
+    
+    print(f"{split}: {len(samples)} 张图像，{len(class_names)} 个类别，"
+          f"写入 {num_shards} 个分片到 {output_dir}")
+    return shard_paths
+
+
+def main():
+    """主函数：解析命令行参数并生成TFRecord文件"""
+    parser = argparse.ArgumentParser(description='将图像数据集转换为分片TFRecord文件')
+    
+    parser.add_argument('--train_dir', type=str, required=True,
+                       help='训练数据目录路径')
+    parser.add_argument('--validation_dir', type=str, required=True,
+                       help='验证数据目录路径')
+    parser.add_argument('--output_dir', type=str, required=True,
+                       help='TFRecord输出目录')
+    parser.add_argument('--shard_size_mb', type=int, default=200,
+                       help='每个分片的目标大小（MB，默认: 200）')
+    
+    args = parser.parse_args()
+    
+    write_tfrecords(args.train_dir, args.output_dir, 'train', args.shard_size_mb)
+    write_tfrecords(args.validation_dir, args.output_dir, 'validation', args.shard_size_mb)
+
+
+if __name__ == '__main__':
+    main()
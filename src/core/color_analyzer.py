@@ -2,73 +2,180 @@
 颜色分析模块
 
 提供图像颜色提取、颜色分类和颜色搭配评估功能。
-使用OpenCV进行图像处理，使用scikit-learn进行K-means聚类。
+使用OpenCV进行图像处理和K-means聚类。
 """
 import cv2
 import numpy as np
-from sklearn.cluster import KMeans
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Union
 import math
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
 
+try:
+    import xxhash
+except ImportError:  # xxhash为可选依赖，未安装时使用hashlib.blake2b
+    xxhash = None
 
-def extract_dominant_colors(image_path: str, n_colors: int = 3) -> List[Tuple[Tuple[int, int, int], float]]:
+
+# 主色调调色板：colors为(n, 3)的uint8 RGB数组，percentages为(n,)的float64占比数组
+# （占比只有n个元素，保持float64，转换为列表时不带入float32的舍入误差）
+# 两者按占比从高到低一一对应，可直接用于向量化的分类和距离计算
+Palette = namedtuple('Palette', ['colors', 'percentages'])
+
+# 主色调提取结果缓存：(图像内容哈希, 提取参数) -> Palette（只读数组），按LRU淘汰
+_PALETTE_CACHE_SIZE = 256
+_palette_cache: "OrderedDict[tuple, Palette]" = OrderedDict()
+_palette_cache_lock = threading.Lock()
+
+
+def _hash_bytes(data: bytes) -> str:
+    """计算图像文件内容的快速哈希"""
+    if xxhash is not None:
+        return xxhash.xxh64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def extract_palette(image_path: str, n_colors: int = 3,
+                    n_init: int = 1,
+                    max_iter: int = 20,
+                    sample_size: int = 10000) -> Palette:
     """
-    使用K-means聚类提取图像的主色调
+    使用K-means聚类提取图像的主色调调色板
+    
+    结果按图像文件内容哈希缓存，重复分析同一张图片时直接返回。
+    返回的数组为只读，需要修改时请先复制。
     
     参数:
         image_path (str): 图像文件路径
         n_colors (int): 要提取的主色调数量，默认为3
+        n_init (int): K-means初始化次数（k-means++初始化），默认为1
+        max_iter (int): K-means最大迭代次数，默认为20
+        sample_size (int): 参与聚类和占比统计的最大像素数，超过时均匀随机采样，默认为10000
     
     返回:
-        List[Tuple[Tuple[int, int, int], float]]: 
-            颜色列表，每个元素为((R, G, B), 占比百分比)
+        Palette: (colors, percentages)
+            - colors: 形状为(n, 3)的uint8 RGB数组
+            - percentages: 形状为(n,)的float64占比百分比数组
             按占比从高到低排序
     
     示例:
-        >>> colors = extract_dominant_colors('image.jpg', n_colors=3)
-        >>> print(colors)
-        [((120, 45, 200), 45.2), ((200, 180, 150), 30.5), ((50, 50, 50), 24.3)]
+        >>> palette = extract_palette('image.jpg', n_colors=3)
+        >>> palette.colors.shape
+        (3, 3)
     """
-    # 读取图像
-    image = cv2.imread(image_path)
-    if image is None:
+    # 读取图像文件内容，按内容哈希查找缓存（同一张图片只做一次聚类）
+    try:
+        with open(image_path, 'rb') as f:
+            data = f.read()
+    except OSError:
         raise ValueError(f"无法读取图像文件: {image_path}")
     
-    # 将BGR转换为RGB（OpenCV默认使用BGR格式）
-    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    cache_key = (_hash_bytes(data), n_colors, n_init, max_iter, sample_size)
+    with _palette_cache_lock:
+        cached = _palette_cache.get(cache_key)
+        if cached is not None:
+            _palette_cache.move_to_end(cache_key)
+            return cached
+    
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"无法读取图像文件: {image_path}")
     
     # 将图像重塑为像素列表 (height * width, 3)
+    # 注意：OpenCV读取的像素为BGR顺序。K-means对通道顺序不敏感，
+    # 因此不转换整张图片，只在最后翻转少量聚类中心，省去一次整图拷贝
     pixels = image.reshape(-1, 3)
     
-    # 使用K-means聚类提取主色调
-    # n_init=10: 运行10次不同的初始化，选择最佳结果
-    # random_state=42: 设置随机种子以确保结果可复现
-    kmeans = KMeans(n_clusters=n_colors, n_init=10, random_state=42)
-    kmeans.fit(pixels)
+    # 主色调和占比都是统计量，均匀随机采样部分像素即可得到几乎相同的结果，
+    # 聚类和占比统计都只在样本上进行（多百万像素的大图只处理sample_size个像素）
+    # 固定随机种子保证同一张图片结果可复现
+    if len(pixels) > sample_size:
+        idx = np.random.default_rng(42).choice(len(pixels), sample_size, replace=False)
+        pixels = pixels[idx]
+    
+    # 使用float32：聚类全程保持32位计算，比float64少一半内存带宽（只转换采样后的像素）
+    pixels = pixels.astype(np.float32)
+    
+    # 使用OpenCV的K-means聚类提取主色调
+    # OpenCV直接接受float32输入，省去scikit-learn的输入校验开销
+    # KMEANS_PP_CENTERS: k-means++初始化；固定随机种子以确保结果可复现
+    cv2.setRNGSeed(42)
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, max_iter, 1.0)
+    _, labels, centers = cv2.kmeans(pixels, n_colors, None, criteria,
+                                    n_init, cv2.KMEANS_PP_CENTERS)
     
-    # 获取聚类中心（主色调RGB值）
-    colors = kmeans.cluster_centers_.astype(int)
+    # 获取聚类中心（BGR翻转为RGB得到主色调RGB值）
+    colors = centers[:, ::-1].astype(int)
     
     # 计算每个颜色的占比
-    labels = kmeans.labels_
-    total_pixels = len(labels)
-    color_counts = {}
+    counts = np.bincount(labels.ravel(), minlength=n_colors)
+    percentages = counts * (100.0 / counts.sum())
+    
+    # 跳过没有分到像素的空聚类（全图颜色少于n_colors时会出现），按占比从高到低排序
+    nonzero = np.flatnonzero(counts)
+    order = nonzero[np.argsort(-counts[nonzero], kind='stable')]
+    palette = Palette(
+        colors=np.clip(colors[order], 0, 255).astype(np.uint8),
+        percentages=percentages[order]
+    )
+    palette.colors.flags.writeable = False
+    palette.percentages.flags.writeable = False
+    
+    with _palette_cache_lock:
+        _palette_cache[cache_key] = palette
+        if len(_palette_cache) > _PALETTE_CACHE_SIZE:
+            _palette_cache.popitem(last=False)
+    
+    return palette
+
+
+def extract_dominant_colors(image_path: str, n_colors: int = 3,
+                            n_init: int = 1,
+                            max_iter: int = 20,
+                            sample_size: int = 10000) -> List[Tuple[Tuple[int, int, int], float]]:
+    """
+    使用K-means聚类提取图像的主色调
     
-    for i, label in enumerate(labels):
-        # 转换为Python原生int类型，避免numpy类型问题
-        color_tuple = tuple(int(c) for c in colors[label])
-        color_counts[color_tuple] = color_counts.get(color_tuple, 0) + 1
+    参数同 extract_palette，结果转换为Python原生类型的列表。
     
-    # 计算占比并排序
-    color_percentages = []
-    for color, count in color_counts.items():
-        percentage = (count / total_pixels) * 100
-        color_percentages.append((color, percentage))
+    参数:
+        image_path (str): 图像文件路径
+        n_colors (int): 要提取的主色调数量，默认为3
+        n_init (int): K-means初始化次数，默认为1
+        max_iter (int): K-means最大迭代次数，默认为20
+        sample_size (int): 参与聚类和占比统计的最大像素数，默认为10000
     
-    # 按占比从高到低排序
-    color_percentages.sort(key=lambda x: x[1], reverse=True)
+    返回:
+        List[Tuple[Tuple[int, int, int], float]]: 
+            颜色列表，每个元素为((R, G, B), 占比百分比)
+            按占比从高到低排序
     
-    return color_percentages
+    示例:
+        >>> colors = extract_dominant_colors('image.jpg', n_colors=3)
+        >>> print(colors)
+        [((120, 45, 200), 45.2), ((200, 180, 150), 30.5), ((50, 50, 50), 24.3)]
+    """
+    palette = extract_palette(image_path, n_colors=n_colors, n_init=n_init,
+                              max_iter=max_iter, sample_size=sample_size)
+    return palette_to_list(palette)
+
+
+def palette_to_list(palette: Palette) -> List[Tuple[Tuple[int, int, int], float]]:
+    """
+    将调色板转换为((R, G, B), 占比百分比)列表
+    
+    参数:
+        palette (Palette): extract_palette 的返回值
+    
+    返回:
+        List[Tuple[Tuple[int, int, int], float]]: Python原生类型的颜色列表
+    """
+    return [
+        (tuple(rgb), pct)
+        for rgb, pct in zip(palette.colors.tolist(), palette.percentages.tolist())
+    ]
 
 
 def classify_color_type(rgb: Tuple[int, int, int]) -> Dict[str, str]:
@@ -94,7 +201,14 @@ def classify_color_type(rgb: Tuple[int, int, int]) -> Dict[str, str]:
         {'name': '红', 'tone': '暖色'}
     """
     # 转换为Python原生int类型，处理numpy类型
-    r, g, b = int(rgb[0]), int(rgb[1]), int(rgb[2])
+    # 分类结果按RGB值缓存，返回新字典避免调用方修改缓存内容
+    name, tone = _classify_rgb(int(rgb[0]), int(rgb[1]), int(rgb[2]))
+    return {'name': name, 'tone': tone}
+
+
+@lru_cache(maxsize=4096)
+def _classify_rgb(r: int, g: int, b: int) -> Tuple[str, str]:
+    """classify_color_type的缓存实现，返回(颜色名称, 色系)元组"""
     
     # 计算亮度（使用标准亮度公式）
     brightness = 0.299 * r + 0.587 * g + 0.114 * b
@@ -107,17 +221,17 @@ def classify_color_type(rgb: Tuple[int, int, int]) -> Dict[str, str]:
     # 判断是否为黑白灰
     if diff < 30:  # RGB值接近，可能是黑白灰
         if brightness < 30:
-            return {'name': '黑', 'tone': '中性'}
+            return ('黑', '中性')
         elif brightness > 225:
-            return {'name': '白', 'tone': '中性'}
+            return ('白', '中性')
         else:
-            return {'name': '灰', 'tone': '中性'}
+            return ('灰', '中性')
     
     # 判断主色调
     # 计算各颜色的相对强度
     total = r + g + b
     if total == 0:
-        return {'name': '黑', 'tone': '中性'}
+        return ('黑', '中性')
     
     r_ratio = r / total
     g_ratio = g / total
@@ -125,63 +239,155 @@ def classify_color_type(rgb: Tuple[int, int, int]) -> Dict[str, str]:
     
     # 棕色系（低亮度的橙红色，需要优先判断）
     if brightness < 150 and r > 50 and g > 30 and b < min(r, g) * 0.7 and r > b and g > b:
-        return {'name': '棕', 'tone': '暖色'}
+        return ('棕', '暖色')
     
     # 黄色/橙色系（需要优先于红色判断）
     if r_ratio > 0.35 and g_ratio > 0.3 and r > b and g > b:
         # 橙色：红色明显大于绿色，且绿色也较大
         if r > g * 1.15 and g > 100:
-            return {'name': '橙', 'tone': '暖色'}
+            return ('橙', '暖色')
         else:
             # 黄色
             if brightness > 200:
-                return {'name': '浅黄', 'tone': '暖色'}
+                return ('浅黄', '暖色')
             else:
-                return {'name': '黄', 'tone': '暖色'}
+                return ('黄', '暖色')
     
     # 红色系
     if r_ratio > 0.4 and r > g and r > b:
         if brightness > 200:
-            return {'name': '粉', 'tone': '暖色'}
+            return ('粉', '暖色')
         elif brightness < 80:
-            return {'name': '深红', 'tone': '暖色'}
+            return ('深红', '暖色')
         else:
-            return {'name': '红', 'tone': '暖色'}
+            return ('红', '暖色')
     
     # 绿色系
     if g_ratio > 0.35 and g > r and g > b:
         if brightness > 200:
-            return {'name': '浅绿', 'tone': '冷色'}
+            return ('浅绿', '冷色')
         elif brightness < 100:
-            return {'name': '深绿', 'tone': '冷色'}
+            return ('深绿', '冷色')
         else:
-            return {'name': '绿', 'tone': '冷色'}
+            return ('绿', '冷色')
     
     # 蓝色系
     if b_ratio > 0.4 and b > r and b > g:
         if brightness > 200:
-            return {'name': '浅蓝', 'tone': '冷色'}
+            return ('浅蓝', '冷色')
         elif brightness < 100:
-            return {'name': '深蓝', 'tone': '冷色'}
+            return ('深蓝', '冷色')
         else:
-            return {'name': '蓝', 'tone': '冷色'}
+            return ('蓝', '冷色')
     
     # 紫色系
     if r_ratio > 0.3 and b_ratio > 0.3 and r > g and b > g:
         if brightness > 200:
-            return {'name': '浅紫', 'tone': '冷色'}
+            return ('浅紫', '冷色')
         elif brightness < 100:
-            return {'name': '深紫', 'tone': '冷色'}
+            return ('深紫', '冷色')
         else:
-            return {'name': '紫', 'tone': '冷色'}
+            return ('紫', '冷色')
     
     # 默认情况：根据主要颜色判断
     if max_val == r:
-        return {'name': '红', 'tone': '暖色'}
+        return ('红', '暖色')
     elif max_val == g:
-        return {'name': '绿', 'tone': '冷色'}
+        return ('绿', '冷色')
     else:
-        return {'name': '蓝', 'tone': '冷色'}
+        return ('蓝', '冷色')
+
+
+# 批量分类使用的颜色类型表，classify_color_types_batch 返回其中的下标
+COLOR_TYPES: List[Tuple[str, str]] = [
+    ('黑', '中性'), ('白', '中性'), ('灰', '中性'),
+    ('棕', '暖色'), ('橙', '暖色'), ('浅黄', '暖色'), ('黄', '暖色'),
+    ('粉', '暖色'), ('深红', '暖色'), ('红', '暖色'),
+    ('浅绿', '冷色'), ('深绿', '冷色'), ('绿', '冷色'),
+    ('浅蓝', '冷色'), ('深蓝', '冷色'), ('蓝', '冷色'),
+    ('浅紫', '冷色'), ('深紫', '冷色'), ('紫', '冷色'),
+]
+_COLOR_CODES = {color_type: code for code, color_type in enumerate(COLOR_TYPES)}
+
+
+def classify_color_codes(rgbs: np.ndarray) -> np.ndarray:
+    """
+    批量将RGB颜色归类，返回 COLOR_TYPES 中的类型下标
+    
+    与 classify_color_type 的判断规则完全一致，但用布尔掩码一次处理整个数组，
+    np.select 按条件顺序取第一个成立的分支，对应原函数的 if 判断顺序。
+    
+    参数:
+        rgbs: 形状为(N, 3)的RGB数组
+    
+    返回:
+        np.ndarray: 形状为(N,)的类型下标数组
+    """
+    arr = np.asarray(rgbs, dtype=np.int64).reshape(-1, 3)
+    r, g, b = arr[:, 0], arr[:, 1], arr[:, 2]
+    
+    brightness = 0.299 * r + 0.587 * g + 0.114 * b
+    max_val = arr.max(axis=1)
+    diff = max_val - arr.min(axis=1)
+    total = r + g + b
+    safe_total = np.where(total == 0, 1, total)
+    r_ratio = r / safe_total
+    g_ratio = g / safe_total
+    b_ratio = b / safe_total
+    
+    gray = diff < 30
+    brown = (brightness < 150) & (r > 50) & (g > 30) & (b < np.minimum(r, g) * 0.7) & (r > b) & (g > b)
+    yellow = (r_ratio > 0.35) & (g_ratio > 0.3) & (r > b) & (g > b)
+    red = (r_ratio > 0.4) & (r > g) & (r > b)
+    green = (g_ratio > 0.35) & (g > r) & (g > b)
+    blue = (b_ratio > 0.4) & (b > r) & (b > g)
+    purple = (r_ratio > 0.3) & (b_ratio > 0.3) & (r > g) & (b > g)
+    light = brightness > 200
+    
+    c = _COLOR_CODES
+    conditions = [
+        gray & (brightness < 30), gray & (brightness > 225), gray,
+        total == 0,
+        brown,
+        yellow & (r > g * 1.15) & (g > 100), yellow & light, yellow,
+        red & light, red & (brightness < 80), red,
+        green & light, green & (brightness < 100), green,
+        blue & light, blue & (brightness < 100), blue,
+        purple & light, purple & (brightness < 100), purple,
+        max_val == r, max_val == g,
+    ]
+    choices = [
+        c[('黑', '中性')], c[('白', '中性')], c[('灰', '中性')],
+        c[('黑', '中性')],
+        c[('棕', '暖色')],
+        c[('橙', '暖色')], c[('浅黄', '暖色')], c[('黄', '暖色')],
+        c[('粉', '暖色')], c[('深红', '暖色')], c[('红', '暖色')],
+        c[('浅绿', '冷色')], c[('深绿', '冷色')], c[('绿', '冷色')],
+        c[('浅蓝', '冷色')], c[('深蓝', '冷色')], c[('蓝', '冷色')],
+        c[('浅紫', '冷色')], c[('深紫', '冷色')], c[('紫', '冷色')],
+        c[('红', '暖色')], c[('绿', '冷色')],
+    ]
+    return np.select(conditions, choices, default=c[('蓝', '冷色')])
+
+
+def classify_color_types_batch(rgbs: np.ndarray) -> List[Dict[str, str]]:
+    """
+    批量将RGB颜色归类为颜色类型和色系
+    
+    参数:
+        rgbs: 形状为(N, 3)的RGB数组，或RGB元组列表
+    
+    返回:
+        List[Dict[str, str]]: 与输入顺序一致的分类结果，格式同 classify_color_type
+    
+    示例:
+        >>> classify_color_types_batch([(255, 0, 0), (0, 0, 0)])
+        [{'name': '红', 'tone': '暖色'}, {'name': '黑', 'tone': '中性'}]
+    """
+    return [
+        {'name': COLOR_TYPES[code][0], 'tone': COLOR_TYPES[code][1]}
+        for code in classify_color_codes(rgbs).tolist()
+    ]
 
 
 def calculate_color_distance(color1: Tuple[int, int, int], color2: Tuple[int, int, int]) -> float:
@@ -195,12 +401,31 @@ def calculate_color_distance(color1: Tuple[int, int, int], color2: Tuple[int, in
     返回:
         float: 颜色距离（0-441.67，值越大对比度越高）
     """
-    r1, g1, b1 = color1
-    r2, g2, b2 = color2
-    return math.sqrt((r1 - r2) ** 2 + (g1 - g2) ** 2 + (b1 - b2) ** 2)
+    return math.dist(color1, color2)
 
 
-def evaluate_color_combo(colors_list: List[Tuple[int, int, int]]) -> Dict[str, any]:
+def pairwise_color_distances(rgbs: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """
+    一次计算一组颜色两两之间的欧氏距离
+    
+    参数:
+        rgbs: 形状为(N, 3)的RGB数组，或RGB元组列表
+        dtype: 计算精度，默认float32；结果需要转换为Python浮点数对外返回时使用float64，
+               与 calculate_color_distance 的结果一致
+    
+    返回:
+        np.ndarray: 形状为(N, N)的对称距离矩阵（dtype指定的类型），对角线为0
+    
+    示例:
+        >>> pairwise_color_distances([(0, 0, 0), (255, 255, 255)])[0, 1]
+        441.67294
+    """
+    arr = np.asarray(rgbs, dtype=dtype).reshape(-1, 3)
+    diff = arr[:, None, :] - arr[None, :, :]
+    return np.sqrt((diff * diff).sum(axis=-1))
+
+
+def evaluate_color_combo(colors_list: Union[Palette, List[Tuple[int, int, int]]]) -> Dict[str, any]:
     """
     评估颜色搭配是否协调
     
@@ -211,7 +436,8 @@ def evaluate_color_combo(colors_list: List[Tuple[int, int, int]]) -> Dict[str, a
     4. 避免冲突色：互补色需要谨慎搭配
     
     参数:
-        colors_list (List[Tuple[int, int, int]]): RGB颜色列表
+        colors_list (Palette | List[Tuple[int, int, int]]): 
+            extract_palette 返回的调色板，或RGB颜色列表
     
     返回:
         Dict[str, any]: 包含以下键的字典
@@ -225,14 +451,21 @@ def evaluate_color_combo(colors_list: List[Tuple[int, int, int]]) -> Dict[str, a
         >>> print(result['score'])
         65
     """
-    if not colors_list:
+    # 调色板直接使用其颜色数组，列表只在这里转换一次
+    if isinstance(colors_list, Palette):
+        colors_arr = colors_list.colors
+    else:
+        colors_arr = np.asarray(colors_list, dtype=np.int64).reshape(-1, 3)
+    color_count = len(colors_arr)
+    
+    if color_count == 0:
         return {
             'score': 0,
             'suggestions': ['请提供至少一种颜色'],
             'analysis': {}
         }
     
-    if len(colors_list) == 1:
+    if color_count == 1:
         return {
             'score': 100,
             'suggestions': ['单色搭配，简洁优雅'],
@@ -242,26 +475,23 @@ def evaluate_color_combo(colors_list: List[Tuple[int, int, int]]) -> Dict[str, a
     score = 100
     suggestions = []
     analysis = {
-        'color_count': len(colors_list),
+        'color_count': color_count,
         'color_types': [],
         'tones': [],
         'contrast_scores': []
     }
     
     # 1. 三色原则检查
-    if len(colors_list) > 3:
+    if color_count > 3:
         score -= 20
-        suggestions.append('建议主色调不超过3种，当前有{}种颜色'.format(len(colors_list)))
-    elif len(colors_list) == 3:
+        suggestions.append('建议主色调不超过3种，当前有{}种颜色'.format(color_count))
+    elif color_count == 3:
         suggestions.append('符合三色原则，搭配协调')
     
     # 2. 颜色分类和色系分析
-    color_types = []
-    tones = []
-    for color in colors_list:
-        color_info = classify_color_type(color)
-        color_types.append(color_info['name'])
-        tones.append(color_info['tone'])
+    color_infos = classify_color_types_batch(colors_arr)
+    color_types = [info['name'] for info in color_infos]
+    tones = [info['tone'] for info in color_infos]
     
     analysis['color_types'] = color_types
     analysis['tones'] = tones
@@ -281,15 +511,14 @@ def evaluate_color_combo(colors_list: List[Tuple[int, int, int]]) -> Dict[str, a
             suggestions.append('冷暖色搭配良好，中性色起到了很好的过渡作用')
     
     # 4. 对比度检查
-    min_contrast = float('inf')
-    max_contrast = 0
+    # 一次算出所有颜色两两之间的欧氏距离，取上三角（i < j）部分
+    # （contrast_scores 对外返回，使用float64计算，避免带入float32的舍入误差）
+    distances = pairwise_color_distances(colors_arr, dtype=np.float64)
+    contrasts = distances[np.triu_indices(color_count, k=1)]
     
-    for i in range(len(colors_list)):
-        for j in range(i + 1, len(colors_list)):
-            contrast = calculate_color_distance(colors_list[i], colors_list[j])
-            analysis['contrast_scores'].append(contrast)
-            min_contrast = min(min_contrast, contrast)
-            max_contrast = max(max_contrast, contrast)
+    analysis['contrast_scores'] = contrasts.tolist()
+    min_contrast = float(contrasts.min())
+    max_contrast = float(contrasts.max())
     
     # 对比度过低（颜色太相似）
     if min_contrast < 50:
@@ -325,9 +554,9 @@ def evaluate_color_combo(colors_list: List[Tuple[int, int, int]]) -> Dict[str, a
         suggestions.append('互补色搭配得当，中性色起到了很好的平衡作用')
     
     # 6. 黑白灰的合理使用
-    if neutral_count == len(colors_list):
+    if neutral_count == color_count:
         suggestions.append('中性色搭配，经典且安全')
-    elif neutral_count > 0 and neutral_count < len(colors_list):
+    elif neutral_count > 0 and neutral_count < color_count:
         suggestions.append('中性色与彩色搭配，平衡且优雅')
     
     # 确保分数在0-100范围内
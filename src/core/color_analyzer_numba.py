@@ -0,0 +1,179 @@
+"""
+颜色分类的Numba加速模块
+
+逐像素分类（例如生成整张图片的颜色类别掩码）时，classify_color_type 的
+Python判断链是主要瓶颈。本模块用Numba将同样的判断规则编译为本地代码，
+并按行并行处理像素。Numba为可选依赖，未安装时回退到NumPy向量化实现。
+"""
+
+import numpy as np
+from typing import Dict, List
+
+try:
+    import numba
+except ImportError:  # Numba为可选依赖
+    numba = None
+
+try:
+    from .color_analyzer import COLOR_TYPES, classify_color_codes
+except ImportError:
+    from color_analyzer import COLOR_TYPES, classify_color_codes
+
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def njit(*args, **kwargs):
+    """
+    numba.njit 的包装
+
+    安装了Numba时等同于 numba.njit(*args, **kwargs)，否则原样返回被装饰的函数。
+    支持 @njit 和 @njit(...) 两种写法。
+    """
+    if NUMBA_AVAILABLE:
+        return numba.njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func):
+        return func
+    return decorator
+
+
+prange = numba.prange if NUMBA_AVAILABLE else range
+
+
+# 类型下标，Numba编译时作为常量内联
+_CODES = {color_type: code for code, color_type in enumerate(COLOR_TYPES)}
+_BLACK = _CODES[('黑', '中性')]
+_WHITE = _CODES[('白', '中性')]
+_GRAY = _CODES[('灰', '中性')]
+_BROWN = _CODES[('棕', '暖色')]
+_ORANGE = _CODES[('橙', '暖色')]
+_LIGHT_YELLOW = _CODES[('浅黄', '暖色')]
+_YELLOW = _CODES[('黄', '暖色')]
+_PINK = _CODES[('粉', '暖色')]
+_DARK_RED = _CODES[('深红', '暖色')]
+_RED = _CODES[('红', '暖色')]
+_LIGHT_GREEN = _CODES[('浅绿', '冷色')]
+_DARK_GREEN = _CODES[('深绿', '冷色')]
+_GREEN = _CODES[('绿', '冷色')]
+_LIGHT_BLUE = _CODES[('浅蓝', '冷色')]
+_DARK_BLUE = _CODES[('深蓝', '冷色')]
+_BLUE = _CODES[('蓝', '冷色')]
+_LIGHT_PURPLE = _CODES[('浅紫', '冷色')]
+_DARK_PURPLE = _CODES[('深紫', '冷色')]
+_PURPLE = _CODES[('紫', '冷色')]
+
+
+@njit
+def _classify_int(r, g, b):
+    """单个颜色的分类，规则与 classify_color_type 完全一致，返回类型下标"""
+    brightness = 0.299 * r + 0.587 * g + 0.114 * b
+    max_val = max(r, g, b)
+    min_val = min(r, g, b)
+
+    if max_val - min_val < 30:
+        if brightness < 30:
+            return _BLACK
+        elif brightness > 225:
+            return _WHITE
+        return _GRAY
+
+    total = r + g + b
+    if total == 0:
+        return _BLACK
+
+    r_ratio = r / total
+    g_ratio = g / total
+    b_ratio = b / total
+
+    if brightness < 150 and r > 50 and g > 30 and b < min(r, g) * 0.7 and r > b and g > b:
+        return _BROWN
+
+    if r_ratio > 0.35 and g_ratio > 0.3 and r > b and g > b:
+        if r > g * 1.15 and g > 100:
+            return _ORANGE
+        elif brightness > 200:
+            return _LIGHT_YELLOW
+        return _YELLOW
+
+    if r_ratio > 0.4 and r > g and r > b:
+        if brightness > 200:
+            return _PINK
+        elif brightness < 80:
+            return _DARK_RED
+        return _RED
+
+    if g_ratio > 0.35 and g > r and g > b:
+        if brightness > 200:
+            return _LIGHT_GREEN
+        elif brightness < 100:
+            return _DARK_GREEN
+        return _GREEN
+
+    if b_ratio > 0.4 and b > r and b > g:
+        if brightness > 200:
+            return _LIGHT_BLUE
+        elif brightness < 100:
+            return _DARK_BLUE
+        return _BLUE
+
+    if r_ratio > 0.3 and b_ratio > 0.3 and r > g and b > g:
+        if brightness > 200:
+            return _LIGHT_PURPLE
+        elif brightness < 100:
+            return _DARK_PURPLE
+        return _PURPLE
+
+    if max_val == r:
+        return _RED
+    elif max_val == g:
+        return _GREEN
+    return _BLUE
+
+
+@njit(parallel=True)
+def _classify_rows(rgb2d, out):
+    """并行分类(N, 3)数组的每一行，结果写入out"""
+    for i in prange(rgb2d.shape[0]):
+        # 转为int64，避免uint8相加溢出
+        out[i] = _classify_int(np.int64(rgb2d[i, 0]), np.int64(rgb2d[i, 1]), np.int64(rgb2d[i, 2]))
+
+
+def classify_pixels(rgbs: np.ndarray) -> np.ndarray:
+    """
+    批量分类像素颜色，返回 COLOR_TYPES 中的类型下标
+
+    参数:
+        rgbs: 形状为(..., 3)的RGB数组，例如(H, W, 3)的整张图片
+
+    返回:
+        np.ndarray: 与输入前几维形状相同的int8类型下标数组
+    """
+    arr = np.asarray(rgbs)
+    shape = arr.shape[:-1]
+    rgb2d = np.ascontiguousarray(arr.reshape(-1, 3))
+
+    if not NUMBA_AVAILABLE:
+        return classify_color_codes(rgb2d).astype(np.int8).reshape(shape)
+
+    out = np.empty(rgb2d.shape[0], dtype=np.int8)
+    _classify_rows(rgb2d, out)
+    return out.reshape(shape)
+
+
+def codes_to_types(codes: np.ndarray) -> List[Dict[str, str]]:
+    """
+    将类型下标转换为 classify_color_type 格式的结果列表
+
+    参数:
+        codes: 类型下标数组
+
+    返回:
+        List[Dict[str, str]]: 每个元素为{'name': 颜色名称, 'tone': 色系}
+    """
+    return [
+        {'name': COLOR_TYPES[code][0], 'tone': COLOR_TYPES[code][1]}
+        for code in np.asarray(codes).ravel().tolist()
+    ]
@@ -12,7 +12,11 @@ from tensorflow.keras.applications import MobileNetV2
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
 import numpy as np
 import os
-from typing import Tuple, Optional
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Dict, Tuple, Optional
 
 
 # 服装类别定义
@@ -30,6 +34,16 @@ CLASS_NAMES = [
 NUM_CLASSES = len(CLASS_NAMES)
 IMG_SIZE = 224  # MobileNetV2输入尺寸
 
+# 已加载模型缓存（按模型路径），避免每次预测都重新解析HDF5权重
+_MODEL_CACHE: Dict[str, keras.Model] = {}
+
+# 每个模型对应的XLA编译前向函数，模型被释放时自动移除
+_FORWARD_FNS: "weakref.WeakKeyDictionary[keras.Model, tf.types.experimental.GenericFunction]" = weakref.WeakKeyDictionary()
+
+# 每个TFLite解释器对应的锁：解释器不是线程安全的，set_tensor/invoke/get_tensor须整体互斥
+_TFLITE_LOCKS: "weakref.WeakKeyDictionary[tf.lite.Interpreter, threading.Lock]" = weakref.WeakKeyDictionary()
+_TFLITE_LOCKS_GUARD = threading.Lock()
+
 
 def create_model(input_shape: Tuple[int, int, int] = (IMG_SIZE, IMG_SIZE, 3),
                  num_classes: int = NUM_CLASSES,
@@ -56,12 +70,12 @@ def create_model(input_shape: Tuple[int, int, int] = (IMG_SIZE, IMG_SIZE, 3),
     # 冻结基础模型权重（迁移学习标准做法）
     base_model.trainable = base_model_trainable
     
-    # 构建模型
-    inputs = keras.Input(shape=input_shape)
+    # 构建模型：输入为uint8像素（0-255），传输到GPU的数据量只有float32的1/4
+    inputs = keras.Input(shape=input_shape, dtype='uint8')
     
-    # 注意：预处理在数据生成器中完成（rescale=1./255）
-    # 这里直接使用归一化后的输入（0-1范围）
-    x = inputs
+    # 在模型内缩放到MobileNetV2预训练时使用的[-1, 1]范围，
+    # 与第一层卷积一起在GPU上执行（XLA下可融合进卷积）
+    x = layers.Rescaling(1. / 127.5, offset=-1.0, name='rescaling')(inputs)
     
     # 通过基础模型
     x = base_model(x, training=False)
@@ -72,8 +86,8 @@ def create_model(input_shape: Tuple[int, int, int] = (IMG_SIZE, IMG_SIZE, 3),
     # Dropout层防止过拟合
     x = layers.Dropout(0.2)(x)
     
-    # 分类层
-    outputs = layers.Dense(num_classes, activation='softmax', name='predictions')(x)
+    # 分类层（混合精度训练时softmax仍以float32计算，避免数值不稳定）
+    outputs = layers.Dense(num_classes, activation='softmax', dtype='float32', name='predictions')(x)
     
     # 创建模型
     model = keras.Model(inputs, outputs, name='outfit_classifier')
@@ -88,6 +102,9 @@ def get_data_generators(train_dir: str,
     """
     创建数据生成器，包含数据增强
     
+    生成的图像归一化到[0, 1]，只适用于旧版（float32输入）的模型；
+    create_model 创建的模型以uint8像素为输入，请使用 build_tf_dataset。
+    
     参数:
         train_dir: 训练数据目录路径
         validation_dir: 验证数据目录路径
@@ -139,25 +156,171 @@ def get_data_generators(train_dir: str,
     return train_generator, validation_generator
 
 
-def compile_model(model: keras.Model, learning_rate: float = 0.0001) -> keras.Model:
+def _to_uint8(images: tf.Tensor) -> tf.Tensor:
+    """将0-255范围的浮点图像四舍五入并截断为uint8"""
+    return tf.cast(tf.clip_by_value(tf.round(images), 0.0, 255.0), tf.uint8)
+
+
+def build_tf_dataset(data_dir: str,
+                     batch_size: int = 32,
+                     training: bool = False,
+                     img_size: int = IMG_SIZE,
+                     cache: Optional[str] = None) -> tf.data.Dataset:
+    """
+    使用tf.data构建训练/验证数据集
+    
+    相比ImageDataGenerator，解码、缩放和数据增强都在TensorFlow运行时中并行执行，
+    并通过prefetch与模型计算重叠，避免GPU等待数据。
+    
+    参数:
+        data_dir: 数据目录路径（每个类别一个子目录）
+        batch_size: 批次大小
+        training: 是否为训练集（训练集会打乱顺序并进行数据增强）
+        img_size: 图像尺寸
+        cache: 解码缩放后图像的缓存位置。None不缓存，''缓存在内存，
+               其他值为缓存文件路径（数据集放不进内存时使用）
+    
+    返回:
+        tf.data.Dataset: 产出(图像, one-hot标签)批次的数据集，图像为uint8像素（0-255）
+    """
+    autotune = tf.data.AUTOTUNE
+    
+    # 逐张读取（不分批），便于之后先打乱再分批
+    dataset = keras.utils.image_dataset_from_directory(
+        data_dir,
+        labels='inferred',
+        label_mode='categorical',
+        image_size=(img_size, img_size),
+        batch_size=None,
+        shuffle=training,
+        seed=42
+    )
+    
+    # 缩放后的图像为float32，转回uint8（归一化在模型内完成）
+    dataset = dataset.map(
+        lambda x, y: (_to_uint8(x), y),
+        num_parallel_calls=autotune
+    )
+    
+    return _batch_dataset(dataset, batch_size, training, cache)
+
+
+def _batch_dataset(dataset: tf.data.Dataset,
+                   batch_size: int,
+                   training: bool,
+                   cache: Optional[str] = None) -> tf.data.Dataset:
+    """缓存、打乱、分批、数据增强并预取（build_tf_dataset 与 build_tfrecord_dataset 共用）"""
+    autotune = tf.data.AUTOTUNE
+    
+    # 缓存放在解码之后、打乱和随机增强之前：
+    # 之后每轮都不再读取和解码图像，而每轮的数据增强仍然不同
+    if cache is not None:
+        dataset = dataset.cache(cache)
+    
+    if training:
+        dataset = dataset.shuffle(buffer_size=1000, seed=42, reshuffle_each_iteration=True)
+    
+    dataset = dataset.batch(batch_size)
+    
+    if training:
+        # 数据增强（对应原ImageDataGenerator的旋转、平移、缩放和水平翻转），按批次执行
+        augmentation = keras.Sequential([
+            layers.RandomFlip('horizontal'),
+            layers.RandomRotation(20 / 360, fill_mode='nearest'),
+            layers.RandomTranslation(0.2, 0.2, fill_mode='nearest'),
+            layers.RandomZoom(0.2, fill_mode='nearest'),
+        ], name='augmentation')
+        dataset = dataset.map(
+            lambda x, y: (_to_uint8(augmentation(x, training=True)), y),
+            num_parallel_calls=autotune
+        )
+    
+    # 最后一步预取，使数据准备与训练步骤重叠
+    return dataset.prefetch(autotune)
+
+
+def build_tfrecord_dataset(file_pattern: str,
+                           batch_size: int = 32,
+                           training: bool = False,
+                           img_size: int = IMG_SIZE,
+                           num_classes: int = NUM_CLASSES,
+                           cache: Optional[str] = None) -> tf.data.Dataset:
+    """
+    从分片TFRecord文件构建数据集（文件由 build_tfrecords.py 生成）
+    
+    多个分片通过interleave并行读取，解码与缩放也并行执行，
+    之后的打乱、分批和数据增强与 build_tf_dataset 相同。
+    
+    参数:
+        file_pattern: 分片文件匹配模式，例如 data/tfrecords/train-*.tfrecord
+        batch_size: 批次大小
+        training: 是否为训练集（训练集会打乱顺序并进行数据增强）
+        img_size: 图像尺寸
+        num_classes: 类别数量，用于生成one-hot标签
+        cache: 解码缩放后图像的缓存位置，含义同 build_tf_dataset
+    
+    返回:
+        tf.data.Dataset: 产出(图像, one-hot标签)批次的数据集，图像为uint8像素（0-255）
+    """
+    autotune = tf.data.AUTOTUNE
+    feature_spec = {
+        'image/encoded': tf.io.FixedLenFeature([], tf.string),
+        'image/class/label': tf.io.FixedLenFeature([], tf.int64),
+    }
+    
+    def parse_example(serialized):
+        example = tf.io.parse_single_example(serialized, feature_spec)
+        img = tf.io.decode_image(example['image/encoded'], channels=3, expand_animations=False)
+        img = tf.image.resize(img, [img_size, img_size], method='bilinear')
+        img = _to_uint8(img)
+        label = tf.one_hot(example['image/class/label'], num_classes)
+        return img, label
+    
+    files = tf.data.Dataset.list_files(file_pattern, shuffle=training, seed=42)
+    
+    # 并行读取多个分片；训练时不要求确定顺序，让先就绪的分片先产出
+    dataset = files.interleave(
+        tf.data.TFRecordDataset,
+        cycle_length=autotune,
+        num_parallel_calls=autotune,
+        deterministic=not training
+    )
+    dataset = dataset.map(parse_example, num_parallel_calls=autotune)
+    
+    return _batch_dataset(dataset, batch_size, training, cache)
+
+
+def compile_model(model: keras.Model,
+                  learning_rate: float = 0.0001,
+                  mixed_precision: bool = False,
+                  jit_compile: bool = True) -> keras.Model:
     """
     编译模型
     
     参数:
         model: 未编译的模型
         learning_rate: 学习率，默认0.0001（迁移学习建议使用较小学习率）
+        mixed_precision: 是否使用混合精度训练，开启时用LossScaleOptimizer包装优化器，
+                         防止float16梯度下溢
+        jit_compile: 是否使用XLA编译训练步骤，默认开启；个别环境下XLA不可用时可关闭
     
     返回:
         keras.Model: 编译好的模型
     """
     # 使用TopKCategoricalAccuracy代替字符串'top_3_accuracy'
+    # jit_compile=True: 使用XLA将逐元素运算融合进卷积内核，减少算子间的内存读写
+    optimizer = keras.optimizers.Adam(learning_rate=learning_rate)
+    if mixed_precision:
+        optimizer = keras.mixed_precision.LossScaleOptimizer(optimizer)
+    
     model.compile(
-        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
+        optimizer=optimizer,
         loss='categorical_crossentropy',
         metrics=[
             'accuracy',
             keras.metrics.TopKCategoricalAccuracy(k=3, name='top_3_accuracy')
-        ]
+        ],
+        jit_compile=jit_compile
     )
     
     return model
@@ -205,6 +368,24 @@ def load_model(model_path: str) -> keras.Model:
     return model
 
 
+def get_model(model_path: str) -> keras.Model:
+    """
+    获取模型（带缓存）
+    
+    同一路径的模型只加载一次，之后直接返回缓存的实例。
+    
+    参数:
+        model_path: 模型文件路径
+    
+    返回:
+        keras.Model: 加载的模型
+    """
+    key = os.path.abspath(model_path)
+    if key not in _MODEL_CACHE:
+        _MODEL_CACHE[key] = load_model(model_path)
+    return _MODEL_CACHE[key]
+
+
 def get_class_name(class_index: int) -> str:
     """
     根据类别索引获取类别名称
@@ -221,39 +402,267 @@ def get_class_name(class_index: int) -> str:
         raise ValueError(f"无效的类别索引: {class_index}, 应该在0-{len(CLASS_NAMES)-1}之间")
 
 
-def preprocess_image(image_path: str, img_size: int = IMG_SIZE) -> np.ndarray:
+def preprocess_image(image_path: str, img_size: int = IMG_SIZE, uint8: bool = False) -> tf.Tensor:
     """
     预处理单张图像用于预测
     
+    使用TensorFlow完成读取、解码、缩放和归一化，避免PIL与NumPy之间的多次拷贝。
+    
     参数:
         image_path: 图像文件路径
         img_size: 图像尺寸
+        uint8: 为True时返回0-255的uint8像素（供以uint8为输入的模型使用，
+               缩放后直接取整，不经过0-1归一化再还原）
     
     返回:
-        np.ndarray: 预处理后的图像数组，形状为(1, img_size, img_size, 3)
+        tf.Tensor: 预处理后的图像张量，形状为(1, img_size, img_size, 3)，
+                   默认为归一化到0-1的float32，uint8=True时为uint8
+    """
+    # 读取并解码图像（channels=3 会把灰度/RGBA统一转换为RGB）
+    raw = tf.io.read_file(image_path)
+    img = tf.io.decode_image(raw, channels=3, expand_animations=False)
+    
+    # 调整大小（结果为float32）
+    img = tf.image.resize(img, [img_size, img_size], method='bilinear')
+    
+    if uint8:
+        img = _to_uint8(img)
+    else:
+        # 归一化到0-1
+        img = tf.cast(img, tf.float32) * (1.0 / 255.0)
+    
+    # 添加批次维度
+    return tf.expand_dims(img, 0)
+
+
+def export_tflite_int8(model: keras.Model, representative_data, out_path: str) -> str:
     """
-    from PIL import Image
+    将模型做int8训练后量化并导出为TFLite文件
     
-    # 读取图像
-    img = Image.open(image_path)
+    int8模型体积约为FP32的1/4，CPU上可使用整数点积指令加速推理。
+    
+    参数:
+        model: 训练好的Keras模型
+        representative_data: 校准数据，可多次迭代的序列，
+            每个元素为preprocess_image输出的(1, IMG_SIZE, IMG_SIZE, 3)张量
+        out_path: 输出的.tflite文件路径
     
-    # 转换为RGB（处理RGBA等情况）
-    if img.mode != 'RGB':
-        img = img.convert('RGB')
+    返回:
+        str: 输出文件路径
+    """
+    # 以uint8像素为输入的模型，校准数据同样需要还原为0-255像素
+    if takes_uint8_input(model):
+        representative_dataset = lambda: ([_to_uint8(x * 255.0)] for x in representative_data)
+    else:
+        representative_dataset = lambda: ([x] for x in representative_data)
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.uint8
+    converter.inference_output_type = tf.uint8
+    
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(out_path, 'wb') as f:
+        f.write(converter.convert())
+    print(f"int8量化模型已保存到: {out_path}")
+    
+    return out_path
+
+
+def load_tflite_interpreter(model_path: str, num_threads: Optional[int] = None) -> tf.lite.Interpreter:
+    """
+    加载TFLite模型
     
-    # 调整大小
-    img = img.resize((img_size, img_size))
+    参数:
+        model_path: .tflite文件路径
+        num_threads: 推理线程数，默认为CPU核心数
     
-    # 转换为numpy数组
-    img_array = np.array(img)
+    返回:
+        tf.lite.Interpreter: 已分配张量的解释器
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"模型文件不存在: {model_path}")
     
-    # 归一化到0-1
-    img_array = img_array.astype('float32') / 255.0
+    interpreter = tf.lite.Interpreter(model_path=model_path,
+                                      num_threads=num_threads or os.cpu_count())
+    interpreter.allocate_tensors()
+    _tflite_lock(interpreter)
+    print(f"TFLite模型已从 {model_path} 加载")
     
-    # 添加批次维度
-    img_array = np.expand_dims(img_array, axis=0)
+    return interpreter
+
+
+def _tflite_lock(interpreter: tf.lite.Interpreter) -> threading.Lock:
+    """获取解释器对应的锁（首次使用时创建）"""
+    with _TFLITE_LOCKS_GUARD:
+        lock = _TFLITE_LOCKS.get(interpreter)
+        if lock is None:
+            lock = _TFLITE_LOCKS[interpreter] = threading.Lock()
+        return lock
+
+
+def run_tflite(interpreter: tf.lite.Interpreter, batch) -> np.ndarray:
+    """
+    使用TFLite解释器推理一批图像
+    
+    输入为preprocess_image的0-1浮点结果，按模型的量化参数转换为uint8
+    （模型本身以uint8像素为输入时直接还原为0-255像素）；输出按量化参数还原为浮点概率。
+    同一解释器在多个线程（如Web服务的并发请求）间共享时，推理过程按解释器加锁串行执行。
     
-    return img_array
+    参数:
+        interpreter: load_tflite_interpreter返回的解释器
+        batch: 形状为(B, IMG_SIZE, IMG_SIZE, 3)的float32图像
+    
+    返回:
+        np.ndarray: 形状为(B, num_classes)的概率矩阵
+    """
+    input_detail = interpreter.get_input_details()[0]
+    output_detail = interpreter.get_output_details()[0]
+    batch = np.asarray(batch, dtype=np.float32)
+    
+    in_scale, in_zero = input_detail['quantization']
+    if in_scale:
+        batch = np.clip(np.round(batch / in_scale + in_zero), 0, 255)
+    elif np.issubdtype(input_detail['dtype'], np.integer):
+        batch = np.clip(np.round(batch * 255.0), 0, 255)
+    batch = batch.astype(input_detail['dtype'])
+    
+    # 量化模型的输入批次固定为1，逐张推理
+    outputs = []
+    with _tflite_lock(interpreter):
+        for row in batch:
+            interpreter.set_tensor(input_detail['index'], row[np.newaxis])
+            interpreter.invoke()
+            outputs.append(interpreter.get_tensor(output_detail['index'])[0])
+    probs = np.stack(outputs).astype(np.float32)
+    
+    out_scale, out_zero = output_detail['quantization']
+    if out_scale:
+        probs = (probs - out_zero) * out_scale
+    
+    return probs
+
+
+def run_model(model, batch) -> np.ndarray:
+    """
+    对一批预处理后的图像执行前向计算
+    
+    参数:
+        model: Keras模型或TFLite解释器
+        batch: 形状为(B, IMG_SIZE, IMG_SIZE, 3)的图像
+    
+    返回:
+        np.ndarray: 形状为(B, num_classes)的概率矩阵
+    """
+    if isinstance(model, tf.lite.Interpreter):
+        return run_tflite(model, batch)
+    batch = np.asarray(batch)
+    if takes_uint8_input(model) and batch.dtype != np.uint8:
+        # 兼容传入0-1浮点图像的调用方
+        batch = np.clip(np.round(batch * 255.0), 0, 255).astype(np.uint8)
+    return get_forward_fn(model)(batch).numpy()
+
+
+def takes_uint8_input(model: keras.Model) -> bool:
+    """
+    判断模型是否以uint8像素（0-255）为输入
+    
+    create_model 创建的模型在模型内部完成归一化，输入为uint8；
+    旧版模型的输入为归一化到[0, 1]的float32图像。
+    """
+    return tf.as_dtype(model.inputs[0].dtype) == tf.uint8
+
+
+def wants_uint8_images(model) -> bool:
+    """
+    判断预测时是否应直接预处理为uint8像素
+    
+    以uint8为输入的Keras模型返回True；TFLite解释器和旧版float输入模型
+    使用0-1浮点图像（TFLite按量化参数自行转换）。
+    """
+    return not isinstance(model, tf.lite.Interpreter) and takes_uint8_input(model)
+
+
+def get_forward_fn(model: keras.Model):
+    """
+    获取模型的XLA编译推理函数
+    
+    每个模型只创建一次；固定输入签名（批次维度可变），首次调用时完成追踪，
+    之后不同批次大小不会重新追踪。但jit_compile=True时XLA按具体形状编译，
+    每遇到一个新的批次大小仍会编译一次（之后同样大小的批次复用编译结果），
+    因此首个使用新批次大小的请求（如 /analyze_batch）仍有一次编译开销。
+    输入类型与模型一致：以uint8为输入的模型接收0-255的uint8图像
+    （preprocess_image(..., uint8=True)），旧版模型接收0-1浮点图像。
+    
+    参数:
+        model: Keras模型
+    
+    返回:
+        可调用对象，输入图像批次，返回概率张量
+    """
+    forward = _FORWARD_FNS.get(model)
+    if forward is None:
+        # 闭包只持有弱引用，避免缓存反过来阻止模型被释放
+        model_ref = weakref.ref(model)
+        input_dtype = tf.uint8 if takes_uint8_input(model) else tf.float32
+    
+        @tf.function(
+            input_signature=[tf.TensorSpec([None, IMG_SIZE, IMG_SIZE, 3], input_dtype)],
+            jit_compile=True
+        )
+        def forward(x):
+            return model_ref()(x, training=False)
+        _FORWARD_FNS[model] = forward
+    return forward
+
+
+def decode_predictions(predictions: np.ndarray, top_k: int = 3) -> list:
+    """
+    将模型输出的概率转换为top_k预测结果
+    
+    参数:
+        predictions: 单张图像的概率向量，形状为(num_classes,)
+        top_k: 返回前k个预测结果
+    
+    返回:
+        list: 预测结果列表，每个元素为{'class': 类别名, 'confidence': 置信度}
+    """
+    return decode_predictions_batch(np.asarray(predictions)[None, :], top_k)[0]
+
+
+def decode_predictions_batch(predictions: np.ndarray, top_k: int = 3) -> list:
+    """
+    将一批概率矩阵转换为每张图像的top_k预测结果
+    
+    用argpartition在O(C)时间内选出每行前k个类别，只对这k个结果排序，
+    整个批次一次完成，不逐行做完整排序。
+    
+    参数:
+        predictions: 概率矩阵，形状为(B, num_classes)
+        top_k: 返回前k个预测结果
+    
+    返回:
+        list: 长度为B的列表，每个元素为该图像的预测结果列表
+    """
+    predictions = np.asarray(predictions)
+    k = min(top_k, predictions.shape[1])
+    if k <= 0:
+        return [[] for _ in range(len(predictions))]
+    
+    top_indices = np.argpartition(-predictions, k - 1, axis=1)[:, :k]
+    top_probs = np.take_along_axis(predictions, top_indices, axis=1)
+    order = np.argsort(-top_probs, axis=1)
+    top_indices = np.take_along_axis(top_indices, order, axis=1)
+    top_probs = np.take_along_axis(top_probs, order, axis=1)
+    
+    return [
+        [{'class': get_class_name(idx), 'confidence': prob} for idx, prob in zip(indices, probs)]
+        for indices, probs in zip(top_indices.tolist(), top_probs.tolist())
+    ]
 
 
 def predict_image(model: keras.Model, image_path: str, top_k: int = 3) -> list:
@@ -261,28 +670,77 @@ def predict_image(model: keras.Model, image_path: str, top_k: int = 3) -> list:
     预测单张图像的类别
     
     参数:
-        model: 训练好的模型
+        model: 训练好的模型（Keras模型或TFLite解释器）
         image_path: 图像文件路径
         top_k: 返回前k个预测结果
     
     返回:
         list: 预测结果列表，每个元素为{'class': 类别名, 'confidence': 置信度}
     """
-    # 预处理图像
-    img_array = preprocess_image(image_path)
+    # 预处理图像（以uint8为输入的模型直接得到uint8像素）
+    img_array = preprocess_image(image_path, uint8=wants_uint8_images(model))
+    
+    # 预测（单张图像直接调用模型，跳过 model.predict 面向大数据集的批处理开销）
+    predictions = run_model(model, img_array)
+    
+    return decode_predictions(predictions[0], top_k)
+
+
+def _load_image_safe(image_path: str, uint8: bool = False) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """读取并预处理单张图像，返回(图像数组, None)或(None, 错误信息)"""
+    try:
+        return preprocess_image(image_path, uint8=uint8)[0].numpy(), None
+    except Exception as e:
+        return None, str(e)
+
+
+def predict_images(model: keras.Model, image_paths: list, top_k: int = 3,
+                   batch_size: int = 32, num_workers: Optional[int] = None) -> list:
+    """
+    批量预测多张图像的类别
+    
+    图像读取和解码在线程池中并行进行（解码时会释放GIL），并与模型推理重叠；
+    同一时刻最多预先解码两个批次的图像。
+    每batch_size张图像拼成一个(B, IMG_SIZE, IMG_SIZE, 3)批次，只调用一次模型。
+    读取或解码失败的图像不参与推理，在结果中单独记录错误。
     
-    # 预测
-    predictions = model.predict(img_array, verbose=0)
+    参数:
+        model: 训练好的模型（Keras模型或TFLite解释器）
+        image_paths: 图像文件路径列表
+        top_k: 返回前k个预测结果
+        batch_size: 每次送入模型的图像数量
+        num_workers: 解码线程数，默认为CPU核心数
     
-    # 获取top_k预测结果
-    top_indices = np.argsort(predictions[0])[-top_k:][::-1]
+    返回:
+        list: 与image_paths顺序一致的(预测结果列表或None, 错误信息或None)元组
+    """
+    image_paths = list(image_paths)
+    uint8 = wants_uint8_images(model)
+    # 解码窗口：最多提前解码两个批次，既能在推理当前批次时继续解码后续图像，
+    # 又不会一次性解码全部图像占满内存
+    window = 2 * batch_size
     
     results = []
-    for idx in top_indices:
-        results.append({
-            'class': get_class_name(idx),
-            'confidence': float(predictions[0][idx])
-        })
+    with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count()) as executor:
+        pending = deque(executor.submit(_load_image_safe, path, uint8) for path in image_paths[:window])
+        next_index = len(pending)
+    
+        while pending:
+            chunk = [pending.popleft().result() for _ in range(min(batch_size, len(pending)))]
+    
+            # 补充解码窗口，与下面的模型推理重叠进行
+            for path in image_paths[next_index:next_index + len(chunk)]:
+                pending.append(executor.submit(_load_image_safe, path, uint8))
+            next_index += len(chunk)
+    
+            valid_arrays = [array for array, error in chunk if error is None]
+            decoded = iter(decode_predictions_batch(run_model(model, np.stack(valid_arrays)), top_k)
+                           if valid_arrays else ())
+    
+            for array, error in chunk:
+                if error is None:
+                    results.append((next(decoded), None))
+                else:
+                    results.append((None, error))
     
     return results
-
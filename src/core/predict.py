@@ -11,8 +11,10 @@ from PIL import Image
 import tensorflow as tf
 try:
     from .model_utils import (
-        load_model,
+        get_model,
+        load_tflite_interpreter,
         predict_image,
+        predict_images,
         preprocess_image,
         get_class_name,
         CLASS_NAMES,
@@ -24,8 +26,10 @@ except ImportError:
     import os
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
     from model_utils import (
-        load_model,
+        get_model,
+        load_tflite_interpreter,
         predict_image,
+        predict_images,
         preprocess_image,
         get_class_name,
         CLASS_NAMES,
@@ -33,6 +37,29 @@ except ImportError:
     )
 
 
+# 已加载的TFLite解释器缓存（按模型路径），避免重复解析模型文件
+_INTERPRETERS = {}
+
+
+def load_predictor(model_path: str):
+    """
+    按扩展名加载预测模型
+    
+    .tflite文件加载为TFLite解释器，其余格式加载为Keras模型，均按路径缓存。
+    
+    参数:
+        model_path: 模型文件路径
+    
+    返回:
+        Keras模型或TFLite解释器
+    """
+    if model_path.endswith('.tflite'):
+        if model_path not in _INTERPRETERS:
+            _INTERPRETERS[model_path] = load_tflite_interpreter(model_path, num_threads=os.cpu_count())
+        return _INTERPRETERS[model_path]
+    return get_model(model_path)
+
+
 def predict_single_image(model_path: str, image_path: str, top_k: int = 3):
     """
     预测单张图像
@@ -48,7 +75,7 @@ def predict_single_image(model_path: str, image_path: str, top_k: int = 3):
     
     # 加载模型
     print(f"\n加载模型: {model_path}")
-    model = load_model(model_path)
+    model = load_predictor(model_path)
     
     # 检查图像文件
     if not os.path.exists(image_path):
@@ -71,7 +98,8 @@ def predict_single_image(model_path: str, image_path: str, top_k: int = 3):
     return results
 
 
-def predict_batch(model_path: str, image_dir: str, top_k: int = 3, output_file: str = None):
+def predict_batch(model_path: str, image_dir: str, top_k: int = 3, output_file: str = None,
+                  batch_size: int = 32):
     """
     批量预测图像
     
@@ -80,6 +108,7 @@ def predict_batch(model_path: str, image_dir: str, top_k: int = 3, output_file:
         image_dir: 图像目录路径
         top_k: 返回前k个预测结果
         output_file: 输出文件路径（CSV格式），如果为None则只打印结果
+        batch_size: 每次送入模型的图像数量（默认: 32）
     """
     print("=" * 60)
     print("批量预测服装款式")
@@ -87,7 +116,7 @@ def predict_batch(model_path: str, image_dir: str, top_k: int = 3, output_file:
     
     # 加载模型
     print(f"\n加载模型: {model_path}")
-    model = load_model(model_path)
+    model = load_predictor(model_path)
     
     # 获取所有图像文件
     image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif'}
@@ -103,12 +132,12 @@ def predict_batch(model_path: str, image_dir: str, top_k: int = 3, output_file:
     
     print(f"\n找到 {len(image_files)} 张图像")
     
-    # 预测所有图像
+    # 预测所有图像（按批次送入模型，每批只调用一次前向计算）
     all_results = []
     
-    for image_path in image_files:
-        try:
-            results = predict_image(model, image_path, top_k=top_k)
+    predictions = predict_images(model, image_files, top_k=top_k, batch_size=batch_size)
+    for image_path, (results, error) in zip(image_files, predictions):
+        if error is None:
             all_results.append({
                 'image': os.path.basename(image_path),
                 'predictions': results
@@ -119,13 +148,12 @@ def predict_batch(model_path: str, image_dir: str, top_k: int = 3, output_file:
             for i, result in enumerate(results, 1):
                 confidence_percent = result['confidence'] * 100
                 print(f"  {i}. {result['class']:8} - {confidence_percent:.2f}%")
-        
-        except Exception as e:
-            print(f"\n{os.path.basename(image_path)}: 预测失败 - {e}")
+        else:
+            print(f"\n{os.path.basename(image_path)}: 预测失败 - {error}")
             all_results.append({
                 'image': os.path.basename(image_path),
                 'predictions': None,
-                'error': str(e)
+                'error': error
             })
     
     # 保存到文件
@@ -161,7 +189,7 @@ def main():
     parser = argparse.ArgumentParser(description='服装款式识别预测')
     
     parser.add_argument('--model', type=str, required=True,
-                       help='模型文件路径')
+                       help='模型文件路径（.h5 或 int8量化的 .tflite）')
     parser.add_argument('--image', type=str, default=None,
                        help='单张图像文件路径')
     parser.add_argument('--image_dir', type=str, default=None,
@@ -170,6 +198,8 @@ def main():
                        help='返回前k个预测结果（默认: 3）')
     parser.add_argument('--output', type=str, default=None,
                        help='批量预测结果输出文件路径（CSV格式）')
+    parser.add_argument('--batch_size', type=int, default=32,
+                       help='批量预测时每批图像数量（默认: 32）')
     
     args = parser.parse_args()
     
@@ -184,7 +214,7 @@ def main():
     if args.image:
         predict_single_image(args.model, args.image, args.top_k)
     else:
-        predict_batch(args.model, args.image_dir, args.top_k, args.output)
+        predict_batch(args.model, args.image_dir, args.top_k, args.output, args.batch_size)
 
 
 if __name__ == '__main__':
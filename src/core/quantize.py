@@ -0,0 +1,100 @@
+"""
+模型量化脚本
+
+将训练好的Keras模型做int8训练后量化，导出为TFLite文件，用于CPU推理。
+量化需要少量代表性图像校准激活值范围，通常取训练集中的100张左右即可。
+
+使用方法:
+    python src/core/quantize.py --model models/best_model.h5 --calib_dir data/train
+"""
+
+import os
+import argparse
+import random
+try:
+    from .model_utils import (
+        get_model,
+        export_tflite_int8,
+        preprocess_image
+    )
+except ImportError:
+    # 如果作为脚本直接运行，使用绝对导入
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from model_utils import (
+        get_model,
+        export_tflite_int8,
+        preprocess_image
+    )
+
+
+def collect_calibration_images(calib_dir: str, num_samples: int = 100, seed: int = 42) -> list:
+    """
+    从目录（含子目录）中随机选取校准图像
+    
+    参数:
+        calib_dir: 图像目录，例如训练集目录 data/train
+        num_samples: 最多选取的图像数量
+        seed: 随机种子，保证每次量化使用相同的校准集
+    
+    返回:
+        list: 图像文件路径列表
+    """
+    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif'}
+    image_files = []
+    
+    for root, _, files in os.walk(calib_dir):
+        for file in files:
+            if os.path.splitext(file)[1].lower() in image_extensions:
+                image_files.append(os.path.join(root, file))
+    
+    image_files.sort()
+    random.Random(seed).shuffle(image_files)
+    return image_files[:num_samples]
+
+
+def quantize_model(model_path: str, calib_dir: str, output_path: str, num_samples: int = 100) -> str:
+    """
+    量化模型并导出为TFLite文件
+    
+    参数:
+        model_path: Keras模型文件路径（.h5）
+        calib_dir: 校准图像目录
+        output_path: 输出的.tflite文件路径
+        num_samples: 校准图像数量
+    
+    返回:
+        str: 输出文件路径
+    """
+    image_files = collect_calibration_images(calib_dir, num_samples)
+    if not image_files:
+        raise ValueError(f"在 {calib_dir} 中未找到校准图像")
+    print(f"使用 {len(image_files)} 张图像校准量化参数")
+    
+    model = get_model(model_path)
+    representative_data = [preprocess_image(path) for path in image_files]
+    
+    return export_tflite_int8(model, representative_data, output_path)
+
+
+def main():
+    """主函数：解析命令行参数并执行量化"""
+    parser = argparse.ArgumentParser(description='将款式识别模型量化为int8 TFLite模型')
+    
+    parser.add_argument('--model', type=str, required=True,
+                       help='Keras模型文件路径（.h5）')
+    parser.add_argument('--calib_dir', type=str, required=True,
+                       help='校准图像目录（例如训练集目录）')
+    parser.add_argument('--output', type=str, default=None,
+                       help='输出的.tflite文件路径（默认: 与模型同名的 _int8.tflite）')
+    parser.add_argument('--num_samples', type=int, default=100,
+                       help='校准图像数量（默认: 100）')
+    
+    args = parser.parse_args()
+    
+    output_path = args.output or os.path.splitext(args.model)[0] + '_int8.tflite'
+    quantize_model(args.model, args.calib_dir, output_path, args.num_samples)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,17 +5,99 @@
 规则可配置，易于扩展。
 """
 
+import sys
+import copy
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+
+import numpy as np
 
 
 # 导入颜色分析功能
 try:
     from .color_analyzer import classify_color_type
+    from .color_analyzer_numba import njit, NUMBA_AVAILABLE
 except ImportError:
     from color_analyzer import classify_color_type
+    from color_analyzer_numba import njit, NUMBA_AVAILABLE
+
+
+# 亮度公式系数（ITU-R BT.601）
+_LUMA = np.array([0.299, 0.587, 0.114])
+
+# 颜色名称的默认亮度值
+_BRIGHTNESS_MAP = {
+    '黑': 0, '深蓝': 50, '深绿': 50, '深红': 50, '深紫': 50,
+    '灰': 128, '棕': 100,
+    '蓝': 150, '绿': 150, '红': 150, '紫': 150,
+    '浅蓝': 200, '浅绿': 200, '粉': 220, '浅紫': 200,
+    '白': 255, '浅黄': 240, '黄': 220, '橙': 200
+}
+
+
+# 中性色（不计入三色原则的主色调）
+_NEUTRAL_COLORS = frozenset({'黑', '白', '灰'})
+
+
+# 款式风格分类
+_FORMAL_STYLES = frozenset({'衬衫', '外套', '皮鞋'})
+_CASUAL_STYLES = frozenset({'T恤', '卫衣', '牛仔裤', '休闲裤', '运动鞋'})
+
+# 款式 -> 风格类型（'formal' / 'casual'），一次字典查找完成分类
+_STYLE_KIND: Dict[str, str] = {style: 'formal' for style in _FORMAL_STYLES}
+_STYLE_KIND.update({style: 'casual' for style in _CASUAL_STYLES})
+
+# 场景与推荐风格的映射
+_CONTEXT_STYLES = {
+    '正式场合': frozenset({'formal'}),
+    '商务': frozenset({'formal'}),
+    '工作': frozenset({'formal', 'casual'}),
+    '休闲': frozenset({'casual'}),
+    '运动': frozenset({'casual'}),
+    '聚会': frozenset({'casual', 'formal'}),
+}
+
+
+@njit
+def _sum_luma(arr):
+    """(N, 3) RGB数组的亮度之和（Numba编译的循环，小数组上比NumPy调用开销更低）"""
+    total = 0.0
+    for i in range(arr.shape[0]):
+        total += 0.299 * arr[i, 0] + 0.587 * arr[i, 1] + 0.114 * arr[i, 2]
+    return total
+
+
+def _avg_brightness(colors: List[Any]) -> float:
+    """
+    计算颜色列表的平均亮度
+    
+    RGB元组的亮度由Numba内核（未安装Numba时用一次矩阵乘法）求和，
+    颜色名称查 _BRIGHTNESS_MAP（未知名称按128计）。
+    """
+    rgbs = [c for c in colors if isinstance(c, tuple)]
+    total = 0.0
+    if rgbs:
+        arr = np.ascontiguousarray(rgbs, dtype=np.float64)
+        total = _sum_luma(arr) if NUMBA_AVAILABLE else float((arr @ _LUMA).sum())
+    total += sum(_BRIGHTNESS_MAP.get(c, 128) for c in colors if not isinstance(c, tuple))
+    return total / len(colors)
+
+
+@lru_cache(maxsize=4096)
+def _classify_rgb(rgb: Tuple[int, int, int]) -> str:
+    """按RGB元组缓存的颜色名称分类（测试中可用 _classify_rgb.cache_clear() 清空）"""
+    return classify_color_type(rgb)['name']
+
+
+def _classify_color_names(colors: List[Any]) -> List[str]:
+    """将颜色列表（RGB元组或颜色名称）转换为颜色名称列表"""
+    return [
+        _classify_rgb(color) if isinstance(color, tuple) else str(color)
+        for color in colors
+    ]
 
 
 class RuleSeverity(Enum):
@@ -25,9 +107,13 @@ class RuleSeverity(Enum):
     ERROR = "error"        # 错误（严重违反）
 
 
-@dataclass
+# dataclass的slots参数需要Python 3.10+，更早版本退化为普通dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class RuleResult:
-    """规则评估结果"""
+    """规则评估结果（使用__slots__，每条结果不创建实例字典）"""
     passed: bool                    # 是否通过
     score: float                    # 评分（0-100）
     message: str                    # 规则说明
@@ -39,6 +125,13 @@ class RuleResult:
 class BaseRule(ABC):
     """规则基类"""
     
+    # 规则需要的穿搭数据键，评估器只在这些数据都非空时调用该规则；
+    # 为空表示总是调用
+    required_keys: Tuple[str, ...] = ()
+    
+    # 每条规则缓存的评估结果数量上限，超过时清空
+    RESULT_CACHE_SIZE = 1024
+    
     def __init__(self, name: str, description: str, weight: float = 1.0, enabled: bool = True):
         """
         初始化规则
@@ -67,6 +160,60 @@ class BaseRule(ABC):
         """
         pass
     
+    def _evaluate_bound(self, outfit_data: Dict[str, Any], colors: List[Any],
+                        styles: Dict[str, str], context: Dict[str, Any]) -> RuleResult:
+        """
+        评估器调用的入口
+        
+        评估器已取出colors、styles、context并确认 required_keys 对应的数据非空，
+        子类可直接调用对应的 _evaluate_* 方法；默认回退到 evaluate。
+        """
+        return self.evaluate(outfit_data)
+    
+    def _cache_key(self, outfit_data: Dict[str, Any], colors: List[Any],
+                   styles: Dict[str, str], context: Dict[str, Any]) -> Optional[tuple]:
+        """
+        评估结果的缓存键
+        
+        由规则实际用到的那部分输入（以及影响结果的规则参数）组成；
+        返回None表示不缓存（默认，例如只重写了evaluate的自定义规则）。
+        """
+        return None
+    
+    def _evaluate_cached(self, outfit_data: Dict[str, Any], colors: List[Any],
+                         styles: Dict[str, str], context: Dict[str, Any]) -> RuleResult:
+        """
+        评估器调用的带缓存入口
+        
+        相同输入的评估结果按 _cache_key 缓存在规则实例上，重复评估同一套穿搭时直接返回。
+        缓存的RuleResult由各次评估共享，调用方不应修改。
+        """
+        key = self._cache_key(outfit_data, colors, styles, context)
+        if key is None:
+            return self._evaluate_bound(outfit_data, colors, styles, context)
+        
+        cache = self.__dict__.setdefault('_result_cache', {})
+        try:
+            result = cache.get(key)
+        except TypeError:
+            # 输入中含有不可哈希的值，不缓存
+            return self._evaluate_bound(outfit_data, colors, styles, context)
+        
+        if result is None:
+            result = self._evaluate_bound(outfit_data, colors, styles, context)
+            if len(cache) >= self.RESULT_CACHE_SIZE:
+                cache.clear()
+            cache[key] = result
+        return result
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 子类只重写了evaluate时，评估器仍调用其evaluate（且不缓存结果）
+        if 'evaluate' in cls.__dict__ and '_evaluate_bound' not in cls.__dict__:
+            cls._evaluate_bound = BaseRule._evaluate_bound
+            if '_cache_key' not in cls.__dict__:
+                cls._cache_key = BaseRule._cache_key
+    
     def __repr__(self):
         return f"{self.__class__.__name__}(name='{self.name}', enabled={self.enabled})"
 
@@ -74,6 +221,8 @@ class BaseRule(ABC):
 class ColorRule(BaseRule):
     """颜色相关规则基类"""
     
+    required_keys = ('colors',)
+    
     def evaluate(self, outfit_data: Dict[str, Any]) -> RuleResult:
         """评估颜色规则"""
         colors = outfit_data.get('colors', [])
@@ -86,15 +235,58 @@ class ColorRule(BaseRule):
             )
         return self._evaluate_colors(colors, outfit_data)
     
+    def _evaluate_bound(self, outfit_data, colors, styles, context):
+        return self._evaluate_colors(colors, outfit_data)
+    
     @abstractmethod
     def _evaluate_colors(self, colors: List[Any], outfit_data: Dict[str, Any]) -> RuleResult:
         """评估颜色（子类实现）"""
         pass
 
+    @staticmethod
+    def _get_color_names(colors: List[Any], outfit_data: Dict[str, Any]) -> List[str]:
+        """
+        获取颜色名称列表
+        
+        优先使用 RuleEvaluator 预先计算的 'color_names'，
+        直接调用规则（未经评估器）时现场分类。
+        """
+        color_names = outfit_data.get('color_names')
+        if color_names is None:
+            color_names = _classify_color_names(colors)
+        return color_names
+    
+    @staticmethod
+    def _get_color_name_set(colors: List[Any], outfit_data: Dict[str, Any]) -> frozenset:
+        """获取颜色名称集合，优先使用预先计算的 'color_name_set'"""
+        color_name_set = outfit_data.get('color_name_set')
+        if color_name_set is None:
+            color_name_set = frozenset(ColorRule._get_color_names(colors, outfit_data))
+        return color_name_set
+    
+    @staticmethod
+    def _get_avg_brightness(outfit_data: Dict[str, Any], key: str) -> float:
+        """
+        获取 outfit_data[key] 颜色列表的平均亮度
+        
+        评估器提供 'brightness' 字典时按列表对象缓存结果，
+        上下装颜色都沿用整体颜色（同一个列表）时只计算一次。
+        """
+        colors = outfit_data.get(key, [])
+        cache = outfit_data.get('brightness')
+        if cache is None:
+            return _avg_brightness(colors)
+        brightness = cache.get(id(colors))
+        if brightness is None:
+            brightness = cache[id(colors)] = _avg_brightness(colors)
+        return brightness
+
 
 class StyleRule(BaseRule):
     """款式相关规则基类"""
     
+    required_keys = ('styles',)
+    
     def evaluate(self, outfit_data: Dict[str, Any]) -> RuleResult:
         """评估款式规则"""
         styles = outfit_data.get('styles', {})
@@ -107,6 +299,9 @@ class StyleRule(BaseRule):
             )
         return self._evaluate_styles(styles, outfit_data)
     
+    def _evaluate_bound(self, outfit_data, colors, styles, context):
+        return self._evaluate_styles(styles, outfit_data)
+    
     @abstractmethod
     def _evaluate_styles(self, styles: Dict[str, str], outfit_data: Dict[str, Any]) -> RuleResult:
         """评估款式（子类实现）"""
@@ -116,6 +311,8 @@ class StyleRule(BaseRule):
 class ContextRule(BaseRule):
     """场景相关规则基类"""
     
+    required_keys = ('context',)
+    
     def evaluate(self, outfit_data: Dict[str, Any]) -> RuleResult:
         """评估场景规则"""
         context = outfit_data.get('context', {})
@@ -128,6 +325,9 @@ class ContextRule(BaseRule):
             )
         return self._evaluate_context(context, outfit_data)
     
+    def _evaluate_bound(self, outfit_data, colors, styles, context):
+        return self._evaluate_context(context, outfit_data)
+    
     @abstractmethod
     def _evaluate_context(self, context: Dict[str, Any], outfit_data: Dict[str, Any]) -> RuleResult:
         """评估场景（子类实现）"""
@@ -147,6 +347,12 @@ class ThreeColorRule(ColorRule):
         )
         self.max_colors = max_colors
     
+    def _cache_key(self, outfit_data, colors, styles, context):
+        # 颜色不超过上限时结果只取决于颜色个数，否则取决于颜色名称集合
+        if len(colors) <= self.max_colors:
+            return (self.max_colors, len(colors))
+        return (self.max_colors, self._get_color_name_set(colors, outfit_data))
+    
     def _evaluate_colors(self, colors: List[Any], outfit_data: Dict[str, Any]) -> RuleResult:
         """
         评估三色原则
@@ -154,23 +360,18 @@ class ThreeColorRule(ColorRule):
         参数:
             colors: 颜色列表，每个元素可以是RGB元组或颜色名称字符串
         """
-        # 提取主色调（排除黑白灰等中性色）
-        main_colors = []
-        neutral_colors = {'黑', '白', '灰'}
-        
-        for color in colors:
-            if isinstance(color, tuple):
-                # RGB值，需要分类
-                color_info = classify_color_type(color)
-                color_name = color_info['name']
-            else:
-                color_name = str(color)
-            
-            if color_name not in neutral_colors:
-                if color_name not in main_colors:
-                    main_colors.append(color_name)
+        # 颜色个数不超过上限时主色调必然不超过上限，无需对颜色分类
+        if len(colors) <= self.max_colors:
+            return RuleResult(
+                passed=True,
+                score=100.0,
+                message=f"符合三色原则，颜色共{len(colors)}个（不超过{self.max_colors}种）",
+                severity=RuleSeverity.INFO,
+                weight=self.weight
+            )
         
-        num_main_colors = len(main_colors)
+        # 主色调种数：颜色名称集合去掉黑白灰等中性色（一次集合差运算，无需逐个比较）
+        num_main_colors = len(self._get_color_name_set(colors, outfit_data) - _NEUTRAL_COLORS)
         
         if num_main_colors <= self.max_colors:
             score = 100.0
@@ -198,6 +399,8 @@ class ThreeColorRule(ColorRule):
 class LightTopDarkBottomRule(ColorRule):
     """上浅下深原则：上衣颜色比下装浅"""
     
+    required_keys = ('colors', 'top_colors', 'bottom_colors')
+    
     def __init__(self, weight: float = 1.2):
         super().__init__(
             name="上浅下深原则",
@@ -205,6 +408,9 @@ class LightTopDarkBottomRule(ColorRule):
             weight=weight
         )
     
+    def _cache_key(self, outfit_data, colors, styles, context):
+        return (tuple(outfit_data.get('top_colors', ())), tuple(outfit_data.get('bottom_colors', ())))
+    
     def _evaluate_colors(self, colors: List[Any], outfit_data: Dict[str, Any]) -> RuleResult:
         """评估上浅下深原则"""
         top_colors = outfit_data.get('top_colors', [])
@@ -220,23 +426,8 @@ class LightTopDarkBottomRule(ColorRule):
             )
         
         # 计算平均亮度
-        def get_brightness(color):
-            if isinstance(color, tuple):
-                r, g, b = color
-                return 0.299 * r + 0.587 * g + 0.114 * b
-            else:
-                # 如果是颜色名称，使用默认亮度值
-                brightness_map = {
-                    '黑': 0, '深蓝': 50, '深绿': 50, '深红': 50, '深紫': 50,
-                    '灰': 128, '棕': 100,
-                    '蓝': 150, '绿': 150, '红': 150, '紫': 150,
-                    '浅蓝': 200, '浅绿': 200, '粉': 220, '浅紫': 200,
-                    '白': 255, '浅黄': 240, '黄': 220, '橙': 200
-                }
-                return brightness_map.get(color, 128)
-        
-        top_brightness = sum(get_brightness(c) for c in top_colors) / len(top_colors)
-        bottom_brightness = sum(get_brightness(c) for c in bottom_colors) / len(bottom_colors)
+        top_brightness = self._get_avg_brightness(outfit_data, 'top_colors')
+        bottom_brightness = self._get_avg_brightness(outfit_data, 'bottom_colors')
         
         if top_brightness >= bottom_brightness:
             score = 100.0
@@ -277,30 +468,44 @@ class ForbiddenColorComboRule(ColorRule):
             ({'紫', '深紫', '浅紫'}, {'黄', '浅黄', '橙'}),
             ({'蓝', '深蓝', '浅蓝'}, {'橙', '黄', '浅黄'}),
         ]
+        # 预先转换为frozenset并拼好提示文字
+        self._combos = [
+            (frozenset(combo1), frozenset(combo2), ', '.join(sorted(combo1)), ', '.join(sorted(combo2)))
+            for combo1, combo2 in self.forbidden_combos
+        ]
+        # 所有禁忌组合涉及的颜色
+        self._all = frozenset().union(*(combo1 | combo2 for combo1, combo2, _, _ in self._combos))
+        # 每种涉及的颜色对应一个二进制位，禁忌组合两侧各编码为一个位掩码，
+        # 评估时只需整数与运算；_any_mask 为所有涉及颜色的并集，用于提前排除
+        self._bits = {name: 1 << i for i, name in enumerate(sorted(self._all))}
+        self._combo_masks = [
+            (self._names_mask(combo1), self._names_mask(combo2), f"{combo1_name} 与 {combo2_name}")
+            for combo1, combo2, combo1_name, combo2_name in self._combos
+        ]
+        self._any_mask = self._names_mask(self._all)
+    
+    def _names_mask(self, names) -> int:
+        """颜色名称集合转换为位掩码（未涉及禁忌组合的名称不占位）"""
+        mask = 0
+        for name in names:
+            mask |= self._bits.get(name, 0)
+        return mask
+    
+    def _cache_key(self, outfit_data, colors, styles, context):
+        return self._get_color_name_set(colors, outfit_data)
     
     def _evaluate_colors(self, colors: List[Any], outfit_data: Dict[str, Any]) -> RuleResult:
         """评估禁忌颜色组合"""
-        # 提取所有颜色名称
-        color_names = []
-        for color in colors:
-            if isinstance(color, tuple):
-                color_info = classify_color_type(color)
-                color_names.append(color_info['name'])
-            else:
-                color_names.append(str(color))
-        
-        color_set = set(color_names)
+        # 所有颜色名称的位掩码
+        mask = self._names_mask(self._get_color_name_set(colors, outfit_data))
         
-        # 检查是否有禁忌组合
+        # 与所有涉及颜色无交集时直接通过；否则每条组合只需两次与运算
         violations = []
-        for combo1, combo2 in self.forbidden_combos:
-            has_combo1 = bool(color_set & combo1)
-            has_combo2 = bool(color_set & combo2)
-            
-            if has_combo1 and has_combo2:
-                combo1_name = ', '.join(combo1)
-                combo2_name = ', '.join(combo2)
-                violations.append(f"{combo1_name} 与 {combo2_name}")
+        if mask & self._any_mask:
+            violations = [
+                text for left, right, text in self._combo_masks
+                if mask & left and mask & right
+            ]
         
         if not violations:
             score = 100.0
@@ -325,6 +530,18 @@ class ForbiddenColorComboRule(ColorRule):
         )
 
 
+# 款式协调结论表：风格类型数量 -> (passed, score, message, suggestion, severity)
+_COORDINATION_VERDICTS = {
+    0: (True, 100.0, "无法判断款式风格", None, RuleSeverity.INFO),
+    1: (True, 100.0, "款式风格协调统一", None, RuleSeverity.INFO),
+    # 部分混合，可以接受
+    2: (True, 70.0, "款式风格部分混合，基本协调", "建议统一风格以获得更好的视觉效果", RuleSeverity.WARNING),
+}
+# 风格混乱
+_COORDINATION_MIXED = (False, 40.0, "款式风格不协调，正装与休闲混搭",
+                       "建议统一风格：正装配正装，休闲装配休闲装", RuleSeverity.ERROR)
+
+
 class StyleCoordinationRule(StyleRule):
     """款式协调规则：正装配正装鞋等"""
     
@@ -334,9 +551,12 @@ class StyleCoordinationRule(StyleRule):
             description="上下装和鞋子的风格应该协调",
             weight=weight
         )
-        # 定义风格分类
-        self.formal_styles = {'衬衫', '外套', '皮鞋'}
-        self.casual_styles = {'T恤', '卫衣', '牛仔裤', '休闲裤', '运动鞋'}
+        # 风格分类（模块级常量的别名）
+        self.formal_styles = _FORMAL_STYLES
+        self.casual_styles = _CASUAL_STYLES
+    
+    def _cache_key(self, outfit_data, colors, styles, context):
+        return (styles.get('top', ''), styles.get('bottom', ''), styles.get('shoes', ''))
     
     def _evaluate_styles(self, styles: Dict[str, str], outfit_data: Dict[str, Any]) -> RuleResult:
         """评估款式协调"""
@@ -344,55 +564,14 @@ class StyleCoordinationRule(StyleRule):
         bottom_style = styles.get('bottom', '')
         shoe_style = styles.get('shoes', '')
         
-        # 判断风格类型
-        def get_style_type(style):
-            if style in self.formal_styles:
-                return 'formal'
-            elif style in self.casual_styles:
-                return 'casual'
-            else:
-                return 'unknown'
-        
-        top_type = get_style_type(top_style)
-        bottom_type = get_style_type(bottom_style)
-        shoe_type = get_style_type(shoe_style)
-        
-        # 统计风格类型
-        types = [t for t in [top_type, bottom_type, shoe_type] if t != 'unknown']
-        
-        if not types:
-            return RuleResult(
-                passed=True,
-                score=100.0,
-                message="无法判断款式风格",
-                severity=RuleSeverity.INFO,
-                weight=self.weight
-            )
-        
-        # 检查是否一致
-        unique_types = set(types)
-        
-        if len(unique_types) == 1:
-            score = 100.0
-            passed = True
-            message = "款式风格协调统一"
-            suggestion = None
-            severity = RuleSeverity.INFO
-        elif len(unique_types) == 2:
-            # 部分混合，可以接受
-            score = 70.0
-            passed = True
-            message = "款式风格部分混合，基本协调"
-            suggestion = "建议统一风格以获得更好的视觉效果"
-            severity = RuleSeverity.WARNING
-        else:
-            # 风格混乱
-            score = 40.0
-            passed = False
-            message = "款式风格不协调，正装与休闲混搭"
-            suggestion = "建议统一风格：正装配正装，休闲装配休闲装"
-            severity = RuleSeverity.ERROR
+        # 出现的风格类型（未知款式不计入）
+        kinds = {_STYLE_KIND.get(top_style), _STYLE_KIND.get(bottom_style), _STYLE_KIND.get(shoe_style)}
+        kinds.discard(None)
         
+        # 按风格类型数量查结论表
+        passed, score, message, suggestion, severity = _COORDINATION_VERDICTS.get(
+            len(kinds), _COORDINATION_MIXED
+        )
         return RuleResult(
             passed=passed,
             score=score,
@@ -412,15 +591,13 @@ class ContextAppropriateRule(ContextRule):
             description="根据场景选择合适的穿搭风格",
             weight=weight
         )
-        # 定义场景与风格的映射
-        self.context_styles = {
-            '正式场合': {'formal'},
-            '商务': {'formal'},
-            '工作': {'formal', 'casual'},
-            '休闲': {'casual'},
-            '运动': {'casual'},
-            '聚会': {'casual', 'formal'},
-        }
+        # 场景与风格的映射（模块级常量的别名）
+        self.context_styles = _CONTEXT_STYLES
+    
+    def _cache_key(self, outfit_data, colors, styles, context):
+        styles = outfit_data.get('styles', {})
+        return (context.get('type', ''),
+                styles.get('top', ''), styles.get('bottom', ''), styles.get('shoes', ''))
     
     def _evaluate_context(self, context: Dict[str, Any], outfit_data: Dict[str, Any]) -> RuleResult:
         """评估场景适宜性"""
@@ -437,7 +614,7 @@ class ContextAppropriateRule(ContextRule):
             )
         
         # 获取场景推荐的风格
-        recommended_styles = self.context_styles.get(context_type, set())
+        recommended_styles = self.context_styles.get(context_type, frozenset())
         
         if not recommended_styles:
             return RuleResult(
@@ -453,17 +630,10 @@ class ContextAppropriateRule(ContextRule):
         bottom_style = styles.get('bottom', '')
         shoe_style = styles.get('shoes', '')
         
-        formal_styles = {'衬衫', '外套', '皮鞋'}
-        casual_styles = {'T恤', '卫衣', '牛仔裤', '休闲裤', '运动鞋'}
+        current_kinds = {_STYLE_KIND.get(s) for s in (top_style, bottom_style, shoe_style)}
         
-        current_formal = any(s in formal_styles for s in [top_style, bottom_style, shoe_style])
-        current_casual = any(s in casual_styles for s in [top_style, bottom_style, shoe_style])
-        
-        # 判断是否匹配
-        is_formal_ok = 'formal' in recommended_styles and current_formal
-        is_casual_ok = 'casual' in recommended_styles and current_casual
-        
-        if is_formal_ok or is_casual_ok:
+        # 判断是否匹配：当前穿搭含有场景推荐的任一风格
+        if not recommended_styles.isdisjoint(current_kinds):
             score = 100.0
             passed = True
             message = f"穿搭风格适合{context_type}场景"
@@ -498,51 +668,156 @@ class RuleLibrary:
     def __init__(self):
         """初始化规则库，加载默认规则"""
         self.rules: List[BaseRule] = []
+        # 规则名称 -> 规则，列表保持顺序，字典提供O(1)查找
+        self._by_name: Dict[str, BaseRule] = {}
+        # 启用规则按 required_keys 分组的索引，规则增删或启停时失效
+        self._by_key: Optional[Dict[Tuple[str, ...], List[BaseRule]]] = None
+        # 非空数据键集合 -> 候选规则，输入键的组合很少，每种组合只筛选一次
+        self._candidates: Dict[frozenset, Tuple[BaseRule, ...]] = {}
+        # 启用的规则，规则增删或启停时失效
+        self._enabled_cache: Optional[Tuple[BaseRule, ...]] = None
+        # 规则名称 -> 规则描述，规则增删时失效
+        self._descriptions: Optional[Dict[str, str]] = None
         self._load_default_rules()
     
     def _load_default_rules(self):
         """加载默认规则"""
         # 颜色规则
-        self.rules.append(ThreeColorRule(max_colors=3, weight=1.5))
-        self.rules.append(LightTopDarkBottomRule(weight=1.2))
-        self.rules.append(ForbiddenColorComboRule(weight=1.8))
+        self.add_rule(ThreeColorRule(max_colors=3, weight=1.5))
+        self.add_rule(LightTopDarkBottomRule(weight=1.2))
+        self.add_rule(ForbiddenColorComboRule(weight=1.8))
         
         # 款式规则
-        self.rules.append(StyleCoordinationRule(weight=1.5))
+        self.add_rule(StyleCoordinationRule(weight=1.5))
         
         # 场景规则
-        self.rules.append(ContextAppropriateRule(weight=1.3))
+        self.add_rule(ContextAppropriateRule(weight=1.3))
     
     def add_rule(self, rule: BaseRule):
-        """添加规则"""
+        """
+        添加规则
+        
+        异常:
+            ValueError: 已存在同名规则
+        """
+        if rule.name in self._by_name:
+            raise ValueError(f"规则名称重复: {rule.name}")
         self.rules.append(rule)
+        self._by_name[rule.name] = rule
+        self._invalidate_index()
+        self._descriptions = None
     
     def remove_rule(self, rule_name: str):
         """移除规则"""
+        if self._by_name.pop(rule_name, None) is None:
+            return
         self.rules = [r for r in self.rules if r.name != rule_name]
+        self._invalidate_index()
+        self._descriptions = None
+    
+    def _invalidate_index(self):
+        """规则增删或启停后清空规则索引"""
+        self._by_key = None
+        self._candidates = {}
+        self._enabled_cache = None
+    
+    @property
+    def descriptions(self) -> Dict[str, str]:
+        """规则名称到规则描述的映射（只读，首次访问时计算）"""
+        if self._descriptions is None:
+            self._descriptions = {rule.name: rule.description for rule in self.rules}
+        return self._descriptions
     
     def get_rule(self, rule_name: str) -> Optional[BaseRule]:
         """获取指定规则"""
-        for rule in self.rules:
-            if rule.name == rule_name:
-                return rule
-        return None
+        return self._by_name.get(rule_name)
     
     def enable_rule(self, rule_name: str):
-        """启用规则"""
-        rule = self.get_rule(rule_name)
-        if rule:
-            rule.enabled = True
+        """
+        启用规则
+        
+        异常:
+            KeyError: 规则不存在（例如名称拼写错误）
+        """
+        self._set_enabled(rule_name, True)
     
     def disable_rule(self, rule_name: str):
-        """禁用规则"""
-        rule = self.get_rule(rule_name)
-        if rule:
-            rule.enabled = False
+        """
+        禁用规则
+    
+        异常:
+            KeyError: 规则不存在（例如名称拼写错误）
+        """
+        self._set_enabled(rule_name, False)
+    
+    def _set_enabled(self, rule_name: str, enabled: bool):
+        """按名称启停规则并使规则索引失效"""
+        rule = self._by_name.get(rule_name)
+        if rule is None:
+            raise KeyError(f"规则不存在: {rule_name}")
+        rule.enabled = enabled
+        self._invalidate_index()
+    
+    def get_enabled_rules(self) -> Tuple[BaseRule, ...]:
+        """获取所有启用的规则（不可修改的元组，缓存到规则增删或启停为止）"""
+        if self._enabled_cache is None:
+            self._enabled_cache = tuple(r for r in self.rules if r.enabled)
+        return self._enabled_cache
+    
+    def get_applicable_rules(self, present_keys: frozenset) -> List[BaseRule]:
+        """
+        获取输入数据齐全的启用规则
+        
+        参数:
+            present_keys: 非空的穿搭数据键集合
+        
+        返回:
+            List[BaseRule]: required_keys 全部在 present_keys 中的启用规则，保持规则库中的顺序
+        """
+        return list(self.candidate_rules(present_keys))
+    
+    def candidate_rules(self, present_keys: frozenset) -> Tuple[BaseRule, ...]:
+        """
+        获取输入数据齐全的启用规则（按输入键组合缓存，评估器使用）
+        
+        参数:
+            present_keys: 非空的穿搭数据键集合
+        
+        返回:
+            Tuple[BaseRule, ...]: 与 get_applicable_rules 相同的规则，不可修改
+        """
+        candidates = self._candidates.get(present_keys)
+        if candidates is None:
+            candidates = self._candidates[present_keys] = tuple(self._select_rules(present_keys))
+        return candidates
     
-    def get_enabled_rules(self) -> List[BaseRule]:
-        """获取所有启用的规则"""
-        return [r for r in self.rules if r.enabled]
+    def _select_rules(self, present_keys: frozenset) -> List[BaseRule]:
+        """按 required_keys 分组索引筛选规则"""
+        if self._by_key is None:
+            by_key: Dict[Tuple[str, ...], List[BaseRule]] = {}
+            for rule in self.get_enabled_rules():
+                by_key.setdefault(rule.required_keys, []).append(rule)
+            self._by_key = by_key
+        
+        groups = [rules for keys, rules in self._by_key.items() if present_keys.issuperset(keys)]
+        if len(groups) == 1:
+            return groups[0]
+        
+        # 多个分组合并后按规则库中的顺序排列
+        matched = {id(rule) for rules in groups for rule in rules}
+        return [rule for rule in self.rules if id(rule) in matched]
+
+
+# 共享的默认规则库：未指定规则库的评估器共用同一组规则实例
+_DEFAULT_LIBRARY: Optional[RuleLibrary] = None
+
+
+def _get_default_library() -> RuleLibrary:
+    """获取共享的默认规则库（首次调用时创建）"""
+    global _DEFAULT_LIBRARY
+    if _DEFAULT_LIBRARY is None:
+        _DEFAULT_LIBRARY = RuleLibrary()
+    return _DEFAULT_LIBRARY
 
 
 # ==================== 规则评估器 ====================
@@ -555,9 +830,28 @@ class RuleEvaluator:
         初始化评估器
         
         参数:
-            rule_library: 规则库，如果为None则创建默认规则库
+            rule_library: 规则库，如果为None则使用共享的默认规则库
+                （规则实例在各评估器间共享，首次修改前复制一份，互不影响）
         """
-        self.rule_library = rule_library or RuleLibrary()
+        if rule_library is None:
+            self._rule_library = _get_default_library()
+            self._shared_library = True
+        else:
+            self._rule_library = rule_library
+            self._shared_library = False
+    
+    @property
+    def rule_library(self) -> RuleLibrary:
+        """规则库；仍在使用共享的默认规则库时先复制一份，避免修改影响其他评估器"""
+        if self._shared_library:
+            self._rule_library = copy.deepcopy(self._rule_library)
+            self._shared_library = False
+        return self._rule_library
+    
+    @rule_library.setter
+    def rule_library(self, rule_library: RuleLibrary):
+        self._rule_library = rule_library
+        self._shared_library = False
     
     def evaluate_outfit(self, 
                        colors: Optional[List[Any]] = None,
@@ -580,9 +874,27 @@ class RuleEvaluator:
                 - score: 总体评分（0-100）
                 - passed: 是否通过所有关键规则
                 - results: 各规则评估结果列表
+                - rule_descriptions: 规则名称到规则描述的映射
                 - suggestions: 改进建议列表
                 - summary: 评估摘要
         """
+        # 没有任何输入时直接返回空结果，不调用任何规则
+        if not (colors or styles or context or top_colors or bottom_colors):
+            return {
+                'score': 100.0,
+                'passed': True,
+                'results': [],
+                'rule_descriptions': self._rule_library.descriptions,
+                'suggestions': [],
+                'summary': {
+                    'total_rules': 0,
+                    'passed_rules': 0,
+                    'failed_rules': 0,
+                    'errors': 0,
+                    'warnings': 0
+                }
+            }
+        
         # 构建穿搭数据
         outfit_data = {
             'colors': colors or [],
@@ -592,58 +904,77 @@ class RuleEvaluator:
             'bottom_colors': bottom_colors or (colors or []),
         }
         
-        # 评估所有启用的规则
+        # 颜色名称每套穿搭只分类一次，供所有颜色规则共用
+        color_names = _classify_color_names(outfit_data['colors'])
+        outfit_data['color_names'] = color_names
+        outfit_data['color_name_set'] = frozenset(color_names)
+        # 颜色列表的平均亮度在首次用到时计算，按列表对象共用
+        outfit_data['brightness'] = {}
+        
+        # 只评估输入数据齐全的启用规则（例如未提供款式时跳过款式规则）
+        present_keys = frozenset(key for key, value in outfit_data.items() if value)
         rule_results = []
+        suggestions = []
         total_weighted_score = 0.0
         total_weight = 0.0
+        passed_count = 0
+        error_count = 0
+        warning_count = 0
         
-        for rule in self.rule_library.get_enabled_rules():
-            result = rule.evaluate(outfit_data)
-            result.weight = rule.weight  # 确保权重正确
+        # 各规则共用的输入只取一次，直接传给规则的 _evaluate_* 方法
+        colors = outfit_data['colors']
+        styles = outfit_data['styles']
+        context = outfit_data['context']
+        
+        # 单次遍历：构建结果、收集建议并统计各项计数
+        for rule in self._rule_library.candidate_rules(present_keys):
+            result = rule._evaluate_cached(outfit_data, colors, styles, context)
+            weight = rule.weight  # 以规则当前的权重为准
+            severity = result.severity.value
             rule_results.append({
                 'rule_name': rule.name,
-                'rule_description': rule.description,
                 'passed': result.passed,
                 'score': result.score,
                 'message': result.message,
                 'suggestion': result.suggestion,
-                'severity': result.severity.value,
-                'weight': result.weight
+                'severity': severity,
+                'weight': weight
             })
             
             # 计算加权分数
-            total_weighted_score += result.score * result.weight
-            total_weight += result.weight
-        
-        # 计算总体评分
-        overall_score = total_weighted_score / total_weight if total_weight > 0 else 0.0
-        
-        # 收集建议
-        suggestions = []
-        error_count = 0
-        warning_count = 0
-        
-        for result in rule_results:
-            if result['suggestion']:
+            total_weighted_score += result.score * weight
+            total_weight += weight
+            
+            # 收集建议
+            if result.suggestion:
                 suggestions.append({
-                    'rule': result['rule_name'],
-                    'suggestion': result['suggestion'],
-                    'severity': result['severity']
+                    'rule': rule.name,
+                    'suggestion': result.suggestion,
+                    'severity': severity
                 })
             
-            if result['severity'] == 'error':
+            passed_count += result.passed
+            
+            # 枚举成员是单例，按身份比较；只在写入结果字典时转换为字符串
+            if result.severity is RuleSeverity.ERROR:
                 error_count += 1
-            elif result['severity'] == 'warning':
+            elif result.severity is RuleSeverity.WARNING:
                 warning_count += 1
         
+        # 计算总体评分（有输入但没有规则参与评估时与空输入一致，记为100分）
+        if not rule_results:
+            overall_score = 100.0
+        else:
+            overall_score = total_weighted_score / total_weight if total_weight > 0 else 0.0
+        
         # 判断是否通过（没有严重错误）
         passed = error_count == 0
         
         # 生成摘要
         summary = {
             'total_rules': len(rule_results),
-            'passed_rules': sum(1 for r in rule_results if r['passed']),
-            'failed_rules': sum(1 for r in rule_results if not r['passed']),
+            'passed_rules': passed_count,
+            'failed_rules': len(rule_results) - passed_count,
             'errors': error_count,
             'warnings': warning_count
         }
@@ -652,10 +983,106 @@ class RuleEvaluator:
             'score': round(overall_score, 2),
             'passed': passed,
             'results': rule_results,
+            'rule_descriptions': self._rule_library.descriptions,
             'suggestions': suggestions,
             'summary': summary
         }
     
+    def evaluate_outfit_batch(self,
+                              colors_batch: List[Any],
+                              styles_batch: Optional[List[Optional[Dict[str, str]]]] = None,
+                              contexts_batch: Optional[List[Optional[Dict[str, Any]]]] = None) -> np.ndarray:
+        """
+        批量计算多套穿搭的总体评分（用于对大量候选穿搭排序）
+        
+        启用的规则都是默认规则类型时，由 rule_engine_jit 中Numba编译的内核并行评分；
+        否则逐套调用 evaluate_outfit。批量评分时上下装颜色均使用整体颜色。
+        
+        参数:
+            colors_batch: 每套穿搭的RGB颜色列表，或形状为(N, K, 3)的数组
+            styles_batch: 每套穿搭的款式字典，为None表示都不提供
+            contexts_batch: 每套穿搭的场景字典，为None表示都不提供
+        
+        返回:
+            np.ndarray: 形状为(N,)的评分数组，与逐套评估的'score'一致（保留两位小数）
+        
+        示例:
+            >>> evaluator = create_evaluator()
+            >>> evaluator.evaluate_outfit_batch([[(255, 0, 0), (0, 255, 0)], [(255, 255, 255)]])
+            array([ 80., 100.])
+        """
+        try:
+            from .rule_engine_jit import score_outfits, supports_library
+        except ImportError:
+            from rule_engine_jit import score_outfits, supports_library
+        
+        if supports_library(self._rule_library):
+            return np.round(score_outfits(self._rule_library, colors_batch, styles_batch, contexts_batch), 2)
+        
+        n = len(colors_batch)
+        styles_batch = [None] * n if styles_batch is None else styles_batch
+        contexts_batch = [None] * n if contexts_batch is None else contexts_batch
+        return np.array([
+            self.evaluate_outfit([tuple(int(v) for v in rgb) for rgb in colors], styles, context)['score']
+            for colors, styles, context in zip(colors_batch, styles_batch, contexts_batch)
+        ], dtype=np.float64)
+    
+    def evaluate_batch(self,
+                       colors_arr: np.ndarray,
+                       styles_arr: Optional[np.ndarray] = None,
+                       ctx_arr: Optional[np.ndarray] = None,
+                       styles_present: Optional[np.ndarray] = None,
+                       ctx_present: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        对按字段存放的穿搭数组批量评分（每个字段一个数组，而不是每套穿搭一个字典）
+        
+        款式和场景使用 rule_engine_jit 中 STYLE_ENCODER / CONTEXT_ENCODER 的整数编码，
+        可以用 encode_outfits 从字典列表生成；编码0表示缺失或空值。
+        只含空值的字典（如 {'type': ''}）在 evaluate_outfit 中仍算作提供了输入，
+        需要通过 styles_present / ctx_present 标明（encode_outfits 会一并返回）。
+        
+        参数:
+            colors_arr: 形状为(N, K, 3)的RGB数组
+            styles_arr: 形状为(N, 3)的上衣/下装/鞋子款式编码，为None表示都不提供
+            ctx_arr: 形状为(N,)的场景编码，为None表示都不提供
+            styles_present: 形状为(N,)的布尔数组，每套穿搭是否提供了款式字典，为None时按编码是否非0判断
+            ctx_present: 形状为(N,)的布尔数组，每套穿搭是否提供了场景字典，为None时按编码是否非0判断
+        
+        返回:
+            np.ndarray: 形状为(N,)的评分数组，与逐套评估的'score'一致（保留两位小数）
+        """
+        try:
+            from .rule_engine_jit import STYLE_ENCODER, CONTEXT_ENCODER, score_encoded_outfits, supports_library
+        except ImportError:
+            from rule_engine_jit import STYLE_ENCODER, CONTEXT_ENCODER, score_encoded_outfits, supports_library
+        
+        if supports_library(self._rule_library):
+            return np.round(score_encoded_outfits(self._rule_library, colors_arr, styles_arr, ctx_arr,
+                                                  styles_present, ctx_present), 2)
+        
+        # 有自定义规则时还原为字典逐套评估（缺失和空值都还原为空字符串）
+        n = len(colors_arr)
+        styles_batch = [None] * n
+        if styles_arr is not None:
+            styles_arr = np.asarray(styles_arr)
+            if styles_present is None:
+                styles_present = (styles_arr != 0).any(axis=1)
+            names = [STYLE_ENCODER.decode(column) for column in styles_arr.T]
+            styles_batch = [
+                {key: name or '' for key, name in zip(('top', 'bottom', 'shoes'), row)} if present else None
+                for present, row in zip(np.asarray(styles_present).tolist(), zip(*names))
+            ]
+        contexts_batch = [None] * n
+        if ctx_arr is not None:
+            ctx_arr = np.asarray(ctx_arr)
+            if ctx_present is None:
+                ctx_present = ctx_arr != 0
+            contexts_batch = [
+                {'type': name or ''} if present else None
+                for present, name in zip(np.asarray(ctx_present).tolist(), CONTEXT_ENCODER.decode(ctx_arr))
+            ]
+        return self.evaluate_outfit_batch(list(colors_arr), styles_batch, contexts_batch)
+    
     def add_custom_rule(self, rule: BaseRule):
         """添加自定义规则"""
         self.rule_library.add_rule(rule)
@@ -667,7 +1094,11 @@ class RuleEvaluator:
             if weight is not None:
                 rule.weight = weight
             if enabled is not None:
-                rule.enabled = enabled
+                # 通过规则库启停，使规则索引失效
+                if enabled:
+                    self.rule_library.enable_rule(rule_name)
+                else:
+                    self.rule_library.disable_rule(rule_name)
 
 
 # ==================== 便捷函数 ====================
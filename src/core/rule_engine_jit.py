@@ -0,0 +1,415 @@
+"""
+规则引擎的批量评分模块
+
+推荐场景下需要对大量候选穿搭逐一打分，逐套调用 RuleEvaluator.evaluate_outfit
+时各条规则的Python代码成为瓶颈。本模块把穿搭编码为整数数组：
+    颜色  -> 颜色类型位掩码（COLOR_TYPES 中第i类对应第i位）
+    款式  -> 风格类型位掩码（正装/休闲各占一位）
+    场景  -> 推荐风格位掩码
+再用Numba编译的内核按批次并行计算默认规则的加权总分。
+Numba为可选依赖，未安装时内核以普通Python函数运行，结果相同。
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from .color_analyzer import COLOR_TYPES, classify_color_codes
+    from .color_analyzer_numba import njit, prange
+    from .rule_engine import (
+        RuleLibrary,
+        ThreeColorRule,
+        LightTopDarkBottomRule,
+        ForbiddenColorComboRule,
+        StyleCoordinationRule,
+        ContextAppropriateRule,
+        _STYLE_KIND,
+        _NEUTRAL_COLORS,
+        _CONTEXT_STYLES,
+    )
+except ImportError:
+    from color_analyzer import COLOR_TYPES, classify_color_codes
+    from color_analyzer_numba import njit, prange
+    from rule_engine import (
+        RuleLibrary,
+        ThreeColorRule,
+        LightTopDarkBottomRule,
+        ForbiddenColorComboRule,
+        StyleCoordinationRule,
+        ContextAppropriateRule,
+        _STYLE_KIND,
+        _NEUTRAL_COLORS,
+        _CONTEXT_STYLES,
+    )
+
+
+# 颜色名称 -> 颜色类型下标
+_COLOR_CODES = {name: code for code, (name, _) in enumerate(COLOR_TYPES)}
+
+# 风格类型位
+_KIND_BITS = {'formal': 1, 'casual': 2}
+
+# 款式名称 -> 风格类型位（未知款式为0）
+_STYLE_BITS = {style: _KIND_BITS[kind] for style, kind in _STYLE_KIND.items()}
+
+# 内核支持的规则类型（按类型精确匹配，子类可能改写了评估逻辑）
+_SUPPORTED_RULES = (
+    ThreeColorRule,
+    LightTopDarkBottomRule,
+    ForbiddenColorComboRule,
+    StyleCoordinationRule,
+    ContextAppropriateRule,
+)
+
+
+class CategoryEncoder:
+    """
+    类别名称与整数编码的映射
+    
+    编码0表示缺失（None或空字符串），-1表示不在类别表中的未知名称，
+    已知类别从1开始编号。
+    """
+    
+    def __init__(self, names: Sequence[str]):
+        """
+        参数:
+            names: 类别名称列表，顺序决定编码
+        """
+        self.names = ('',) + tuple(names)
+        self.codes = {name: code for code, name in enumerate(self.names)}
+    
+    def encode(self, values: Sequence[Optional[str]]) -> np.ndarray:
+        """将名称序列编码为int8数组"""
+        return np.array([
+            self.codes.get(value, -1) if value else 0
+            for value in values
+        ], dtype=np.int8)
+    
+    def decode(self, codes: Sequence[int]) -> List[Optional[str]]:
+        """将编码还原为名称（缺失为None，未知为'?'）"""
+        return [self.names[code] if code > 0 else (None if code == 0 else '?') for code in np.asarray(codes).tolist()]
+
+
+# 款式编码（顺序与 model_utils.CLASS_NAMES 一致，编码 = 类别下标 + 1）
+STYLE_ENCODER = CategoryEncoder(('T恤', '衬衫', '卫衣', '外套', '牛仔裤', '休闲裤', '运动鞋', '皮鞋'))
+
+# 场景编码
+CONTEXT_ENCODER = CategoryEncoder(tuple(_CONTEXT_STYLES))
+
+
+def encode_outfits(styles_batch: Sequence[Optional[Dict[str, str]]],
+                   contexts_batch: Sequence[Optional[Dict[str, Any]]]) -> tuple:
+    """
+    将款式字典和场景字典列表编码为 score_encoded_outfits 使用的数组
+    
+    编码0不区分字段缺失和空值，另外返回每套穿搭是否提供了款式/场景字典：
+    与 evaluate_outfit 一致，非空字典（如 {'type': ''}）即视为提供，对应规则参与评分。
+    
+    参数:
+        styles_batch: 每套穿搭的款式字典
+        contexts_batch: 每套穿搭的场景字典
+    
+    返回:
+        tuple: (styles_arr (N, 3) int8, ctx_arr (N,) int8, styles_present (N,) bool, ctx_present (N,) bool)
+    """
+    styles_arr = np.zeros((len(styles_batch), 3), dtype=np.int8)
+    for j, key in enumerate(('top', 'bottom', 'shoes')):
+        styles_arr[:, j] = STYLE_ENCODER.encode([styles.get(key) if styles else None for styles in styles_batch])
+    ctx_arr = CONTEXT_ENCODER.encode([context.get('type') if context else None for context in contexts_batch])
+    styles_present = np.array([bool(styles) for styles in styles_batch], dtype=np.bool_)
+    ctx_present = np.array([bool(context) for context in contexts_batch], dtype=np.bool_)
+    return styles_arr, ctx_arr, styles_present, ctx_present
+
+
+def _names_to_mask(names) -> int:
+    """颜色名称集合转换为颜色类型位掩码（不在 COLOR_TYPES 中的名称忽略）"""
+    mask = 0
+    for name in names:
+        code = _COLOR_CODES.get(name)
+        if code is not None:
+            mask |= 1 << code
+    return mask
+
+
+_NEUTRAL_MASK = _names_to_mask(_NEUTRAL_COLORS)
+
+
+@njit
+def _popcount(mask):
+    """整数中置位的个数"""
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+
+@njit(parallel=True)
+def _score_kernel(color_masks, style_masks, has_styles, context_masks, has_context,
+                  enabled, weights, max_colors, neutral_mask, combo_left, combo_right, out):
+    """
+    并行计算每套穿搭的加权总分
+    
+    规则顺序与 _SUPPORTED_RULES 一致：三色、上浅下深、禁忌组合、款式协调、场景适宜。
+    color_masks为0表示未提供颜色，颜色规则不参与评分。
+    """
+    for i in prange(out.shape[0]):
+        total = 0.0
+        weight = 0.0
+        color_mask = color_masks[i]
+    
+        if color_mask != 0:
+            # 三色原则：非中性色的颜色类型数
+            if enabled[0]:
+                num_main = _popcount(color_mask & ~neutral_mask)
+                score = 100.0
+                if num_main > max_colors:
+                    score = max(0.0, 100.0 - (num_main - max_colors) * 20.0)
+                total += score * weights[0]
+                weight += weights[0]
+    
+            # 上浅下深：批量评分时上下装都使用整体颜色，亮度相同，总是通过
+            if enabled[1]:
+                total += 100.0 * weights[1]
+                weight += weights[1]
+    
+            # 禁忌颜色组合：任一组合两侧都出现即违反
+            if enabled[2]:
+                score = 100.0
+                for j in range(combo_left.shape[0]):
+                    if (color_mask & combo_left[j]) != 0 and (color_mask & combo_right[j]) != 0:
+                        score = 50.0
+                        break
+                total += score * weights[2]
+                weight += weights[2]
+    
+        # 款式协调：出现两种风格类型时部分混合
+        if has_styles[i] and enabled[3]:
+            score = 70.0 if _popcount(style_masks[i]) > 1 else 100.0
+            total += score * weights[3]
+            weight += weights[3]
+    
+        # 场景适宜：场景没有风格要求（或未知场景）时通过，否则穿搭需含推荐风格之一
+        if has_context[i] and enabled[4]:
+            score = 100.0
+            if context_masks[i] != 0 and (context_masks[i] & style_masks[i]) == 0:
+                score = 60.0
+            total += score * weights[4]
+            weight += weights[4]
+    
+        out[i] = total / weight if weight > 0 else 0.0
+
+
+def encode_colors(colors_batch: Sequence[Any]) -> np.ndarray:
+    """
+    将每套穿搭的RGB颜色编码为颜色类型位掩码
+    
+    参数:
+        colors_batch: 每套穿搭的RGB颜色列表，或形状为(N, K, 3)的数组
+    
+    返回:
+        np.ndarray: 形状为(N,)的int64位掩码，没有颜色的穿搭为0
+    """
+    if isinstance(colors_batch, np.ndarray):
+        codes = classify_color_codes(colors_batch.reshape(-1, 3)).reshape(colors_batch.shape[:2])
+        return np.bitwise_or.reduce(np.left_shift(1, codes.astype(np.int64)), axis=1) \
+            if codes.shape[1] else np.zeros(len(codes), dtype=np.int64)
+    
+    lengths = np.array([len(colors or ()) for colors in colors_batch], dtype=np.intp)
+    masks = np.zeros(len(lengths), dtype=np.int64)
+    if lengths.sum() == 0:
+        return masks
+    
+    rgbs = np.array([rgb for colors in colors_batch if colors for rgb in colors])
+    bits = np.left_shift(1, classify_color_codes(rgbs).astype(np.int64))
+    nonempty = lengths > 0
+    # 非空穿搭的起始下标严格递增，reduceat每段恰好是一套穿搭的颜色
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+    masks[nonempty] = np.bitwise_or.reduceat(bits, offsets)
+    return masks
+
+
+def encode_styles(styles_batch: Sequence[Optional[Dict[str, str]]]) -> np.ndarray:
+    """
+    将每套穿搭的款式编码为风格类型位掩码
+    
+    参数:
+        styles_batch: 每套穿搭的款式字典（包含'top', 'bottom', 'shoes'等键）
+    
+    返回:
+        np.ndarray: 形状为(N,)的int64位掩码（正装为1，休闲为2）
+    """
+    return np.array([
+        _STYLE_BITS.get(styles.get('top'), 0)
+        | _STYLE_BITS.get(styles.get('bottom'), 0)
+        | _STYLE_BITS.get(styles.get('shoes'), 0)
+        if styles else 0
+        for styles in styles_batch
+    ], dtype=np.int64)
+
+
+def encode_contexts(contexts_batch: Sequence[Optional[Dict[str, Any]]],
+                    context_styles: Dict[str, frozenset]) -> np.ndarray:
+    """
+    将每套穿搭的场景编码为推荐风格位掩码
+    
+    参数:
+        contexts_batch: 每套穿搭的场景字典（包含'type'等键）
+        context_styles: 场景类型到推荐风格集合的映射
+    
+    返回:
+        np.ndarray: 形状为(N,)的int64位掩码，场景无风格要求时为0
+    """
+    context_bits = {
+        context_type: sum(_KIND_BITS[kind] for kind in kinds)
+        for context_type, kinds in context_styles.items()
+    }
+    return np.array([
+        context_bits.get(context.get('type', ''), 0) if context else 0
+        for context in contexts_batch
+    ], dtype=np.int64)
+
+
+def supports_library(library: RuleLibrary) -> bool:
+    """规则库中启用的规则是否都能由批量内核评分（每类规则至多一条）"""
+    rule_types = [type(rule) for rule in library.get_enabled_rules()]
+    return len(set(rule_types)) == len(rule_types) and all(t in _SUPPORTED_RULES for t in rule_types)
+
+
+def _library_params(library: RuleLibrary) -> tuple:
+    """
+    取出规则库中各类规则的启用状态、权重和参数
+    
+    返回:
+        tuple: (enabled, weights, max_colors, combo_left, combo_right, context_styles)
+    
+    异常:
+        ValueError: 规则库中有内核不支持的规则
+    """
+    if not supports_library(library):
+        raise ValueError("规则库中包含批量评分不支持的规则")
+    
+    # 每类规则取规则库中的启用实例（默认规则库每类只有一条）
+    rules: List[Any] = [None] * len(_SUPPORTED_RULES)
+    for rule in library.get_enabled_rules():
+        rules[_SUPPORTED_RULES.index(type(rule))] = rule
+    enabled = np.array([rule is not None for rule in rules])
+    weights = np.array([rule.weight if rule is not None else 0.0 for rule in rules], dtype=np.float64)
+    
+    three_color, _, forbidden, _, context_rule = rules
+    max_colors = three_color.max_colors if three_color is not None else 0
+    combos = forbidden._combos if forbidden is not None else []
+    combo_left = np.array([_names_to_mask(left) for left, _, _, _ in combos], dtype=np.int64)
+    combo_right = np.array([_names_to_mask(right) for _, right, _, _ in combos], dtype=np.int64)
+    context_styles = context_rule.context_styles if context_rule is not None else {}
+    return enabled, weights, max_colors, combo_left, combo_right, context_styles
+
+
+def _score_masks(params: tuple, color_masks: np.ndarray, style_masks: np.ndarray, has_styles: np.ndarray,
+                 context_masks: np.ndarray, has_context: np.ndarray) -> np.ndarray:
+    """对编码好的结构数组（每个字段一个数组）运行评分内核"""
+    enabled, weights, max_colors, combo_left, combo_right, _ = params
+    out = np.empty(len(color_masks), dtype=np.float64)
+    _score_kernel(
+        color_masks, style_masks, has_styles, context_masks, has_context,
+        enabled, weights, max_colors, _NEUTRAL_MASK,
+        combo_left, combo_right, out
+    )
+    
+    # 没有任何输入的穿搭与 evaluate_outfit 一致，记为100分
+    out[(color_masks == 0) & ~has_styles & ~has_context] = 100.0
+    return out
+
+
+def score_outfits(library: RuleLibrary,
+                  colors_batch: Sequence[Any],
+                  styles_batch: Optional[Sequence[Optional[Dict[str, str]]]] = None,
+                  contexts_batch: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> np.ndarray:
+    """
+    批量计算穿搭的总体评分（与 evaluate_outfit 的'score'一致，未四舍五入）
+    
+    参数:
+        library: 规则库（启用的规则须满足 supports_library）
+        colors_batch: 每套穿搭的RGB颜色列表，或形状为(N, K, 3)的数组
+        styles_batch: 每套穿搭的款式字典，为None表示都不提供
+        contexts_batch: 每套穿搭的场景字典，为None表示都不提供
+    
+    返回:
+        np.ndarray: 形状为(N,)的float64评分数组
+    
+    异常:
+        ValueError: 规则库中有内核不支持的规则，或各批次长度不一致
+    """
+    params = _library_params(library)
+    
+    n = len(colors_batch)
+    styles_batch = [None] * n if styles_batch is None else styles_batch
+    contexts_batch = [None] * n if contexts_batch is None else contexts_batch
+    if len(styles_batch) != n or len(contexts_batch) != n:
+        raise ValueError("colors_batch、styles_batch和contexts_batch的长度必须一致")
+    
+    return _score_masks(
+        params,
+        encode_colors(colors_batch),
+        encode_styles(styles_batch),
+        np.array([bool(styles) for styles in styles_batch], dtype=np.bool_),
+        encode_contexts(contexts_batch, params[-1]),
+        np.array([bool(context) for context in contexts_batch], dtype=np.bool_)
+    )
+
+
+def score_encoded_outfits(library: RuleLibrary,
+                          colors_arr: np.ndarray,
+                          styles_arr: Optional[np.ndarray] = None,
+                          ctx_arr: Optional[np.ndarray] = None,
+                          styles_present: Optional[np.ndarray] = None,
+                          ctx_present: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    对按字段编码的穿搭数组批量评分（未四舍五入）
+    
+    参数:
+        library: 规则库（启用的规则须满足 supports_library）
+        colors_arr: 形状为(N, K, 3)的RGB数组（K可以为0）
+        styles_arr: 形状为(N, 3)的上衣/下装/鞋子款式编码（STYLE_ENCODER），为None表示都不提供
+        ctx_arr: 形状为(N,)的场景编码（CONTEXT_ENCODER），为None表示都不提供
+        styles_present: 形状为(N,)的布尔数组，每套穿搭是否提供了款式字典；
+            为None时按编码是否非0判断（无法表示只含空值的字典）
+        ctx_present: 形状为(N,)的布尔数组，每套穿搭是否提供了场景字典；为None时同上
+    
+    返回:
+        np.ndarray: 形状为(N,)的float64评分数组
+    
+    异常:
+        ValueError: 规则库中有内核不支持的规则，或数组形状不一致
+    """
+    params = _library_params(library)
+    
+    colors_arr = np.asarray(colors_arr)
+    n = len(colors_arr)
+    styles_arr = np.zeros((n, 3), dtype=np.int8) if styles_arr is None else np.asarray(styles_arr)
+    ctx_arr = np.zeros(n, dtype=np.int8) if ctx_arr is None else np.asarray(ctx_arr)
+    styles_present = (styles_arr != 0).any(axis=1) if styles_present is None else np.asarray(styles_present, dtype=np.bool_)
+    ctx_present = ctx_arr != 0 if ctx_present is None else np.asarray(ctx_present, dtype=np.bool_)
+    if (colors_arr.ndim != 3 or styles_arr.shape != (n, 3) or ctx_arr.shape != (n,)
+            or styles_present.shape != (n,) or ctx_present.shape != (n,)):
+        raise ValueError("colors_arr、styles_arr和ctx_arr的形状必须分别为(N, K, 3)、(N, 3)和(N,)，"
+                         "styles_present和ctx_present的形状必须为(N,)")
+    
+    # 编码 -> 位掩码查找表（未知编码-1和缺失编码0都不占位）
+    style_bits = np.array([_STYLE_BITS.get(name, 0) for name in STYLE_ENCODER.names], dtype=np.int64)
+    context_styles = params[-1]
+    context_bits = np.array([
+        sum(_KIND_BITS[kind] for kind in context_styles.get(name, ()))
+        for name in CONTEXT_ENCODER.names
+    ], dtype=np.int64)
+    
+    style_codes = np.maximum(styles_arr, 0)
+    return _score_masks(
+        params,
+        encode_colors(colors_arr),
+        np.bitwise_or.reduce(style_bits[style_codes], axis=1),
+        styles_present,
+        context_bits[np.maximum(ctx_arr, 0)],
+        ctx_present
+    )
@@ -4,11 +4,22 @@
 提供统一的款式识别接口，方便其他模块调用。
 """
 
+from functools import partial
+
+import numpy as np
+
 from .model_utils import (
     create_model,
     load_model,
+    get_model,
+    get_forward_fn,
+    load_tflite_interpreter,
+    run_tflite,
+    decode_predictions,
     predict_image,
+    predict_images,
     preprocess_image,
+    wants_uint8_images,
     get_class_name,
     CLASS_NAMES,
     NUM_CLASSES,
@@ -28,13 +39,19 @@ class StyleRecognizer:
         初始化款式识别器
         
         参数:
-            model_path: 模型文件路径，如果为None则需要后续调用load_model加载
+            model_path: 模型文件路径（.tflite文件按int8量化模型加载），
+                        如果为None则需要后续调用load_model或load_tflite加载
         """
         self.model = None
         self.model_path = model_path
+        self._infer = None
+        self._uint8_input = False  # 推理输入是否为uint8像素（否则为0-1浮点图像）
         
         if model_path:
-            self.load_model(model_path)
+            if model_path.endswith('.tflite'):
+                self.load_tflite(model_path)
+            else:
+                self.load_model(model_path)
     
     def load_model(self, model_path: str):
         """
@@ -43,9 +60,36 @@ class StyleRecognizer:
         参数:
             model_path: 模型文件路径
         """
-        self.model = load_model(model_path)
+        self.model = get_model(model_path)
+        self.model_path = model_path
+        # 固定输入签名的推理函数，只追踪一次
+        self._infer = get_forward_fn(self.model)
+        self._uint8_input = wants_uint8_images(self.model)
+    
+    def load_tflite(self, model_path: str):
+        """
+        加载int8量化的TFLite模型（由 quantize.py 导出），用于CPU推理
+        
+        参数:
+            model_path: .tflite文件路径
+        """
+        self.model = load_tflite_interpreter(model_path)
         self.model_path = model_path
-        print(f"款式识别模型已加载: {model_path}")
+        self._infer = partial(run_tflite, self.model)
+        self._uint8_input = False
+        print(f"款式识别模型已加载（TFLite int8）: {model_path}")
+    
+    def warmup(self):
+        """
+        预热推理函数
+        
+        用一张全零图像调用一次推理函数，提前完成tf.function追踪和XLA编译
+        （TFLite模型则完成委托初始化），避免首个请求承担这部分延迟。
+        """
+        if self.model is None:
+            raise ValueError("模型未加载，请先调用load_model()/load_tflite()或初始化时提供model_path")
+        
+        self._infer(np.zeros((1, IMG_SIZE, IMG_SIZE, 3), dtype=np.uint8 if self._uint8_input else np.float32))
     
     def predict(self, image_path: str, top_k: int = 3) -> list:
         """
@@ -64,38 +108,43 @@ class StyleRecognizer:
             >>> print(results[0]['class'])  # 输出: 'T恤'
         """
         if self.model is None:
-            raise ValueError("模型未加载，请先调用load_model()或初始化时提供model_path")
+            raise ValueError("模型未加载，请先调用load_model()/load_tflite()或初始化时提供model_path")
         
-        return predict_image(self.model, image_path, top_k)
+        probs = np.asarray(self._infer(preprocess_image(image_path, uint8=self._uint8_input)))[0]
+        return decode_predictions(probs, top_k)
     
-    def predict_batch(self, image_paths: list, top_k: int = 3) -> list:
+    def predict_batch(self, image_paths: list, top_k: int = 3, batch_size: int = 32) -> list:
         """
         批量预测图像
         
+        图像拼成批次后一次送入模型，而不是逐张调用；
+        读取失败的图像不参与推理，结果中按原顺序记录错误。
+        
         参数:
             image_paths: 图像文件路径列表
             top_k: 返回前k个预测结果
+            batch_size: 每次送入模型的图像数量
         
         返回:
             list: 预测结果列表，每个元素包含图像路径和预测结果
         """
         if self.model is None:
-            raise ValueError("模型未加载，请先调用load_model()或初始化时提供model_path")
+            raise ValueError("模型未加载，请先调用load_model()/load_tflite()或初始化时提供model_path")
         
         results = []
-        for image_path in image_paths:
-            try:
-                predictions = predict_image(self.model, image_path, top_k)
+        outputs = predict_images(self.model, image_paths, top_k, batch_size=batch_size)
+        for image_path, (predictions, error) in zip(image_paths, outputs):
+            if error is None:
                 results.append({
                     'image_path': image_path,
                     'predictions': predictions,
                     'success': True
                 })
-            except Exception as e:
+            else:
                 results.append({
                     'image_path': image_path,
                     'predictions': None,
-                    'error': str(e),
+                    'error': error,
                     'success': False
                 })
         
@@ -146,6 +195,7 @@ __all__ = [
     'NUM_CLASSES',
     'IMG_SIZE',
     'load_model',
+    'get_model',
     'predict_image',
     'get_class_name'
 ]
@@ -14,7 +14,8 @@ import matplotlib.pyplot as plt
 try:
     from .model_utils import (
         create_model,
-        get_data_generators,
+        build_tf_dataset,
+        build_tfrecord_dataset,
         compile_model,
         save_model,
         NUM_CLASSES,
@@ -28,7 +29,8 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
     from model_utils import (
         create_model,
-        get_data_generators,
+        build_tf_dataset,
+        build_tfrecord_dataset,
         compile_model,
         save_model,
         NUM_CLASSES,
@@ -76,6 +78,36 @@ def plot_training_history(history, save_path: str = None):
     plt.close()
 
 
+def get_distribution_strategy(distributed: bool = False) -> tf.distribute.Strategy:
+    """
+    获取分布式训练策略
+    
+    参数:
+        distributed: 是否启用数据并行训练。设置了TF_CONFIG环境变量时使用多机策略
+                     （MultiWorkerMirroredStrategy），否则在本机所有GPU上同步训练（MirroredStrategy）
+    
+    返回:
+        tf.distribute.Strategy: 训练策略；未启用时为默认的单设备策略
+    """
+    if not distributed:
+        return tf.distribute.get_strategy()
+    if os.environ.get('TF_CONFIG'):
+        return tf.distribute.MultiWorkerMirroredStrategy()
+    return tf.distribute.MirroredStrategy()
+
+
+def is_chief(strategy: tf.distribute.Strategy) -> bool:
+    """
+    判断当前进程是否负责写文件（保存模型、日志等）
+    
+    单机训练时总是返回True；多机训练时只有chief（或没有chief时的0号worker）返回True。
+    """
+    resolver = getattr(strategy, 'cluster_resolver', None)
+    if resolver is None or not resolver.task_type:
+        return True
+    return resolver.task_type == 'chief' or (resolver.task_type == 'worker' and resolver.task_id == 0)
+
+
 def train_model(train_dir: str,
                 validation_dir: str,
                 model_dir: str = 'models',
@@ -84,7 +116,13 @@ def train_model(train_dir: str,
                 learning_rate: float = 0.0001,
                 fine_tune: bool = False,
                 fine_tune_epochs: int = 10,
-                fine_tune_learning_rate: float = 0.00001):
+                fine_tune_learning_rate: float = 0.00001,
+                mixed_precision: bool = False,
+                tfrecord_dir: str = None,
+                distributed: bool = False,
+                jit_compile: bool = True,
+                cache: bool = False,
+                cache_file: str = None):
     """
     训练模型
     
@@ -98,49 +136,94 @@ def train_model(train_dir: str,
         fine_tune: 是否进行微调（解冻部分层）
         fine_tune_epochs: 微调轮数
         fine_tune_learning_rate: 微调学习率
+        mixed_precision: 是否启用混合精度训练（mixed_float16），
+                         在支持Tensor Core的GPU上可显著加快训练并减少显存占用
+        tfrecord_dir: TFRecord分片目录（由build_tfrecords.py生成），
+                      指定时从其中的 train-*/validation-* 分片读取数据，忽略train_dir和validation_dir
+        distributed: 是否在多个GPU（或多台机器）上进行数据并行训练。
+                     此时batch_size为每个GPU的批次大小，学习率按GPU数量线性放大
+        jit_compile: 是否使用XLA编译训练步骤（与混合精度配合时可融合更多float16算子）
+        cache: 是否在内存中缓存解码后的图像，之后每轮训练不再重复读取和解码
+        cache_file: 缓存文件路径（数据集放不进内存时使用，验证集缓存在 <cache_file>_validation），
+                    指定时忽略cache
     """
     print("=" * 60)
     print("开始训练服装款式识别模型")
     print("=" * 60)
     
     # 检查数据目录
-    if not os.path.exists(train_dir):
-        raise ValueError(f"训练数据目录不存在: {train_dir}")
-    if not os.path.exists(validation_dir):
-        raise ValueError(f"验证数据目录不存在: {validation_dir}")
+    if tfrecord_dir:
+        if not os.path.isdir(tfrecord_dir):
+            raise ValueError(f"TFRecord目录不存在: {tfrecord_dir}")
+    else:
+        if not os.path.exists(train_dir):
+            raise ValueError(f"训练数据目录不存在: {train_dir}")
+        if not os.path.exists(validation_dir):
+            raise ValueError(f"验证数据目录不存在: {validation_dir}")
     
     # 创建模型保存目录
     os.makedirs(model_dir, exist_ok=True)
     
-    # 创建数据生成器
-    print("\n创建数据生成器...")
-    train_generator, validation_generator = get_data_generators(
-        train_dir, validation_dir, batch_size=batch_size
-    )
+    # 分布式训练：全局批次 = 每卡批次 × 卡数，学习率同比放大
+    strategy = get_distribution_strategy(distributed)
+    num_replicas = strategy.num_replicas_in_sync
+    chief = is_chief(strategy)
+    if distributed:
+        print(f"\n分布式训练: {type(strategy).__name__}，副本数: {num_replicas}")
+    global_batch_size = batch_size * num_replicas
+    learning_rate *= num_replicas
+    fine_tune_learning_rate *= num_replicas
     
-    print(f"训练样本数: {train_generator.samples}")
-    print(f"验证样本数: {validation_generator.samples}")
-    print(f"类别数: {len(train_generator.class_indices)}")
+    # 解码后图像的缓存位置（None不缓存，''为内存）
+    if cache_file:
+        train_cache, validation_cache = cache_file, f'{cache_file}_validation'
+    elif cache:
+        train_cache = validation_cache = ''
+    else:
+        train_cache = validation_cache = None
+    
+    # 创建数据集
+    print("\n创建数据集...")
+    if tfrecord_dir:
+        train_dataset = build_tfrecord_dataset(
+            os.path.join(tfrecord_dir, 'train-*.tfrecord'), batch_size=global_batch_size,
+            training=True, cache=train_cache
+        )
+        validation_dataset = build_tfrecord_dataset(
+            os.path.join(tfrecord_dir, 'validation-*.tfrecord'), batch_size=global_batch_size,
+            training=False, cache=validation_cache
+        )
+    else:
+        train_dataset = build_tf_dataset(train_dir, batch_size=global_batch_size,
+                                         training=True, cache=train_cache)
+        validation_dataset = build_tf_dataset(validation_dir, batch_size=global_batch_size,
+                                              training=False, cache=validation_cache)
+    
+    # TFRecord数据集的批次数在读取前未知（cardinality为负数）
+    if train_dataset.cardinality() >= 0:
+        print(f"训练批次数: {int(train_dataset.cardinality())}")
+        print(f"验证批次数: {int(validation_dataset.cardinality())}")
+    print(f"类别数: {NUM_CLASSES}")
     print(f"类别: {CLASS_NAMES}")
     
+    # 混合精度策略需在创建模型之前设置，之后创建的层才会使用float16计算
+    if mixed_precision:
+        keras.mixed_precision.set_global_policy('mixed_float16')
+        print("\n已启用混合精度训练 (mixed_float16)")
+    
     # 创建模型
     print("\n创建模型...")
-    model = create_model(num_classes=NUM_CLASSES, base_model_trainable=False)
-    model = compile_model(model, learning_rate=learning_rate)
+    # 模型变量和优化器需在策略作用域内创建，才会在各副本间镜像
+    with strategy.scope():
+        model = create_model(num_classes=NUM_CLASSES, base_model_trainable=False)
+        model = compile_model(model, learning_rate=learning_rate,
+                              mixed_precision=mixed_precision, jit_compile=jit_compile)
     
     print(f"模型参数总数: {model.count_params():,}")
     print(f"可训练参数: {sum([tf.size(w).numpy() for w in model.trainable_weights]):,}")
     
     # 定义回调函数
     callbacks = [
-        # 模型检查点：保存最佳模型
-        ModelCheckpoint(
-            filepath=os.path.join(model_dir, 'best_model.h5'),
-            monitor='val_accuracy',
-            save_best_only=True,
-            mode='max',
-            verbose=1
-        ),
         # 早停：防止过拟合
         EarlyStopping(
             monitor='val_loss',
@@ -155,23 +238,37 @@ def train_model(train_dir: str,
             patience=5,
             min_lr=1e-7,
             verbose=1
-        ),
-        # 记录训练日志
-        CSVLogger(
-            filename=os.path.join(model_dir, 'training_log.csv'),
-            append=False
         )
     ]
     
+    # 只有chief写模型检查点和训练日志，避免多个worker同时写同一文件
+    if chief:
+        callbacks = [
+            # 模型检查点：保存最佳模型
+            ModelCheckpoint(
+                filepath=os.path.join(model_dir, 'best_model.h5'),
+                monitor='val_accuracy',
+                save_best_only=True,
+                mode='max',
+                verbose=1
+            )
+        ] + callbacks + [
+            # 记录训练日志
+            CSVLogger(
+                filename=os.path.join(model_dir, 'training_log.csv'),
+                append=False
+            )
+        ]
+    
     # 第一阶段训练：冻结基础模型
     print("\n" + "=" * 60)
     print("第一阶段训练：冻结基础模型（迁移学习）")
     print("=" * 60)
     
     history = model.fit(
-        train_generator,
+        train_dataset,
         epochs=epochs,
-        validation_data=validation_generator,
+        validation_data=validation_dataset,
         callbacks=callbacks,
         verbose=1
     )
@@ -191,15 +288,17 @@ def train_model(train_dir: str,
             layer.trainable = False
         
         # 重新编译模型（使用更小的学习率）
-        model = compile_model(model, learning_rate=fine_tune_learning_rate)
+        with strategy.scope():
+            model = compile_model(model, learning_rate=fine_tune_learning_rate,
+                                  mixed_precision=mixed_precision, jit_compile=jit_compile)
         
         print(f"微调可训练参数: {sum([tf.size(w).numpy() for w in model.trainable_weights]):,}")
         
         # 继续训练
         fine_tune_history = model.fit(
-            train_generator,
+            train_dataset,
             epochs=fine_tune_epochs,
-            validation_data=validation_generator,
+            validation_data=validation_dataset,
             callbacks=callbacks,
             verbose=1,
             initial_epoch=len(history.history['loss'])
@@ -209,12 +308,13 @@ def train_model(train_dir: str,
         for key in history.history.keys():
             history.history[key].extend(fine_tune_history.history[key])
     
-    # 保存最终模型
-    print("\n保存最终模型...")
-    save_model(model, model_dir, 'outfit_classifier_final')
-    
-    # 绘制训练曲线
-    plot_training_history(history, save_path=os.path.join(model_dir, 'training_history.png'))
+    if chief:
+        # 保存最终模型
+        print("\n保存最终模型...")
+        save_model(model, model_dir, 'outfit_classifier_final')
+        
+        # 绘制训练曲线
+        plot_training_history(history, save_path=os.path.join(model_dir, 'training_history.png'))
     
     print("\n" + "=" * 60)
     print("训练完成！")
@@ -231,10 +331,12 @@ def main():
     """主函数：解析命令行参数并开始训练"""
     parser = argparse.ArgumentParser(description='训练服装款式识别模型')
     
-    parser.add_argument('--train_dir', type=str, required=True,
-                       help='训练数据目录路径')
-    parser.add_argument('--validation_dir', type=str, required=True,
-                       help='验证数据目录路径')
+    parser.add_argument('--train_dir', type=str, default=None,
+                       help='训练数据目录路径（未指定--tfrecord_dir时必需）')
+    parser.add_argument('--validation_dir', type=str, default=None,
+                       help='验证数据目录路径（未指定--tfrecord_dir时必需）')
+    parser.add_argument('--tfrecord_dir', type=str, default=None,
+                       help='TFRecord分片目录（由build_tfrecords.py生成，指定后代替图像目录）')
     parser.add_argument('--model_dir', type=str, default='models',
                        help='模型保存目录（默认: models）')
     parser.add_argument('--batch_size', type=int, default=32,
@@ -249,8 +351,20 @@ def main():
                        help='微调轮数（默认: 10）')
     parser.add_argument('--fine_tune_lr', type=float, default=0.00001,
                        help='微调学习率（默认: 0.00001）')
+    parser.add_argument('--mixed_precision', action='store_true',
+                       help='启用混合精度训练（mixed_float16，需支持Tensor Core的GPU）')
+    parser.add_argument('--cache', action='store_true',
+                       help='在内存中缓存解码后的图像（数据集能放进内存时使用）')
+    parser.add_argument('--cache_file', type=str, default=None,
+                       help='解码后图像的缓存文件路径（数据集较大时使用，例如SSD上的 /tmp/train.cache）')
+    parser.add_argument('--no_xla', action='store_true',
+                       help='关闭XLA编译（默认开启）')
+    parser.add_argument('--distributed', action='store_true',
+                       help='在本机所有GPU上数据并行训练（设置TF_CONFIG时为多机训练），batch_size为每个GPU的批次大小')
     
     args = parser.parse_args()
+    if not args.tfrecord_dir and not (args.train_dir and args.validation_dir):
+        parser.error('需要指定 --train_dir 和 --validation_dir，或者指定 --tfrecord_dir')
     
     # 开始训练
     train_model(
@@ -262,7 +376,13 @@ def main():
         learning_rate=args.learning_rate,
         fine_tune=args.fine_tune,
         fine_tune_epochs=args.fine_tune_epochs,
-        fine_tune_learning_rate=args.fine_tune_lr
+        fine_tune_learning_rate=args.fine_tune_lr,
+        mixed_precision=args.mixed_precision,
+        tfrecord_dir=args.tfrecord_dir,
+        distributed=args.distributed,
+        jit_compile=not args.no_xla,
+        cache=args.cache,
+        cache_file=args.cache_file
     )
 
 
@@ -86,6 +86,11 @@ def parse_args() -> argparse.Namespace:
         default=os.path.join(BASE_DIR, "models", "best_model.h5"),
         help="款式识别模型路径（默认: models/best_model.h5）",
     )
+    parser.add_argument(
+        "--lazy-models",
+        action="store_true",
+        help="启动时不加载模型，首次分析请求时再加载（缩短启动时间）",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -121,10 +126,14 @@ def main() -> None:
     logger.info("模型路径: %s", args.model_path)
 
     # 初始化模型（可失败但不中断服务）
-    try:
-        init_models(model_path=args.model_path)
-    except Exception as exc:  # 记录错误但继续启动（允许无模型运行）
-        logger.error("初始化模型失败: %s", exc, exc_info=True)
+    # 延迟加载时由 /analyze 在首次请求时调用 init_models（使用 app.config['MODEL_PATH']）
+    if args.lazy_models:
+        logger.info("延迟加载模型：首次分析请求时加载")
+    else:
+        try:
+            init_models(model_path=args.model_path)
+        except Exception as exc:  # 记录错误但继续启动（允许无模型运行）
+            logger.error("初始化模型失败: %s", exc, exc_info=True)
 
     # 启动 Flask 应用
     logger.info("Web 服务器启动中...")
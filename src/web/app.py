@@ -6,33 +6,72 @@ Flask Web应用主文件
 
 import os
 import sys
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, render_template, request, jsonify, send_from_directory, abort
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用Flask默认的json序列化
+    orjson = None
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.core import (
-    extract_dominant_colors,
-    classify_color_type,
-    evaluate_color_combo,
-    RuleEvaluator,
-    StyleRecognizer,
-    create_evaluator
-)
+# 核心模块（OpenCV、TensorFlow）在视图函数和 init_models 中按需导入，
+# 导入本模块只加载Flask，缩短Serverless冷启动时间
+if TYPE_CHECKING:
+    from src.core.rule_engine import RuleEvaluator
+    from src.core.style_recognizer import StyleRecognizer
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    使用orjson序列化JSON响应
+    
+    orjson为C实现，序列化 /analyze 这类嵌套较深的结果比标准库json快数倍，
+    且能直接序列化NumPy数组和标量。与Flask默认行为一致，按键排序输出；
+    orjson不支持的类型交给Flask的默认处理。
+    """
+    
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.options).decode()
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        # 直接返回orjson生成的UTF-8字节，省去解码再编码
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.options),
+            mimetype=self.mimetype
+        )
+
 
 # Flask应用配置
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 app = Flask(__name__, 
             template_folder=os.path.join(BASE_DIR, 'static/templates'),
             static_folder=os.path.join(BASE_DIR, 'static'))
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB最大文件大小
 app.config['UPLOAD_FOLDER'] = os.path.join(BASE_DIR, 'static/images/uploads')
 app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'bmp'}
+# 生产环境由nginx/CDN直接提供上传目录中的图片（见 config/nginx.conf.example），
+# 设置 SERVE_UPLOADS=0 后Flask不再处理图片下载；STATIC_CDN_BASE 为图片URL前缀（如CDN域名）
+app.config['SERVE_UPLOADS'] = os.environ.get('SERVE_UPLOADS', '1') != '0'
+app.config['STATIC_CDN_BASE'] = os.environ.get('STATIC_CDN_BASE', '').rstrip('/')
 
 # CORS 配置（允许 Cloudflare Pages 前端调用）
 from flask_cors import CORS
@@ -48,8 +87,93 @@ CORS(app, resources={
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # 全局对象（延迟加载）
-style_recognizer: Optional[StyleRecognizer] = None
-rule_evaluator: Optional[RuleEvaluator] = None
+style_recognizer: Optional['StyleRecognizer'] = None
+rule_evaluator: Optional['RuleEvaluator'] = None
+
+# 分析结果缓存：(图片内容哈希, 文件名, 款式, 场景) -> 分析结果（不含时间戳），按LRU淘汰
+# 同一张衣柜图片再次分析时跳过颜色聚类、款式识别和规则评估
+_ANALYZE_CACHE_SIZE = 512
+_analyze_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_analyze_cache_lock = threading.Lock()
+
+# 上传时顺带计算的内容哈希：(路径, 修改时间, 大小) -> 哈希，/analyze 可据此跳过重新读取文件
+_upload_digests: "OrderedDict[tuple, str]" = OrderedDict()
+
+# 后台磁盘I/O线程池（上传文件的fsync不阻塞请求线程）
+IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='upload-io')
+
+# 批量分析时并行执行颜色提取和规则评估的线程池（OpenCV计算时会释放GIL）
+ANALYZE_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix='analyze')
+
+# 上传文件的读写缓冲区大小
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+# 各场景的穿搭推荐（固定内容，模块加载时构建一次）
+CONTEXT_RECOMMENDATIONS = {
+    '正式场合': {
+        'colors': ['黑', '白', '灰', '深蓝', '深灰'],
+        'styles': {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
+        'tips': [
+            '选择经典的黑白灰配色',
+            '正装风格，避免过于花哨',
+            '皮鞋是正式场合的最佳选择',
+            '保持整体简洁大气'
+        ]
+    },
+    '商务': {
+        'colors': ['深蓝', '深灰', '白', '黑'],
+        'styles': {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
+        'tips': [
+            '商务场合以稳重为主',
+            '深色系更显专业',
+            '保持整洁干净的形象',
+            '避免过于鲜艳的颜色'
+        ]
+    },
+    '工作': {
+        'colors': ['白', '蓝', '灰', '黑'],
+        'styles': {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
+        'tips': [
+            '工作场合要专业但不失活力',
+            '可以选择一些亮色作为点缀',
+            '舒适度也很重要',
+            '选择透气性好的面料'
+        ]
+    },
+    '休闲': {
+        'colors': ['白', '蓝', '灰', '黑', '棕'],
+        'styles': {'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '运动鞋'},
+        'tips': [
+            '休闲场合可以更自由',
+            '选择舒适的单品',
+            '颜色可以更丰富',
+            '搭配要协调即可'
+        ]
+    },
+    '运动': {
+        'colors': ['黑', '白', '灰', '蓝', '红'],
+        'styles': {'top': 'T恤', 'bottom': '休闲裤', 'shoes': '运动鞋'},
+        'tips': [
+            '运动场合以舒适为主',
+            '选择透气性好的材质',
+            '颜色可以更鲜艳',
+            '运动鞋是必备单品'
+        ]
+    }
+}
+
+# /recommend 的响应内容，按场景预先构建
+_RECOMMEND_RESPONSES = {
+    context_type: {
+        'success': True,
+        'context': context_type,
+        'recommendations': rec.get('tips', []),
+        'color_suggestions': rec.get('colors', []),
+        'style_suggestions': rec.get('styles', {})
+    }
+    for context_type, rec in CONTEXT_RECOMMENDATIONS.items()
+}
 
 
 def init_models(model_path: Optional[str] = None):
@@ -69,10 +193,22 @@ def init_models(model_path: Optional[str] = None):
         )
 
     if style_recognizer is None:
+        # 如果已用 quantize.py 导出了同名的int8 TFLite模型，优先使用它做CPU推理
+        if model_path and not model_path.endswith('.tflite'):
+            tflite_path = os.path.splitext(model_path)[0] + '_int8.tflite'
+            if os.path.exists(tflite_path):
+                model_path = tflite_path
+        
         if model_path and os.path.exists(model_path):
             try:
+                # 在首次导入TensorFlow之前设置，屏蔽其启动日志
+                os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+                from src.core.style_recognizer import StyleRecognizer
+                
                 print(f"加载款式识别模型: {model_path}")
                 style_recognizer = StyleRecognizer(model_path)
+                # 启动时完成推理函数的追踪和编译，首个 /analyze 请求无需等待
+                style_recognizer.warmup()
             except Exception as e:
                 print(f"警告: 无法加载款式识别模型: {e}")
                 style_recognizer = None
@@ -80,6 +216,7 @@ def init_models(model_path: Optional[str] = None):
             print(f"提示: 未找到款式识别模型文件: {model_path}，将仅使用颜色和规则分析")
 
     if rule_evaluator is None:
+        from src.core.rule_engine import create_evaluator
         rule_evaluator = create_evaluator()
 
 
@@ -89,15 +226,73 @@ def allowed_file(filename: str) -> bool:
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
 
+def upload_url(filename: str) -> str:
+    """生成上传图片的访问URL（配置了 STATIC_CDN_BASE 时指向CDN）"""
+    return f"{app.config['STATIC_CDN_BASE']}/images/uploads/{filename}"
+
+
+def _file_key(filepath: str) -> tuple:
+    """文件内容哈希的缓存键：路径、修改时间和大小，任一变化即视为文件已改变"""
+    file_stat = os.stat(filepath)
+    return (filepath, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def _fsync_and_close(f) -> None:
+    """将文件落盘后关闭（在IO_POOL中执行）"""
+    try:
+        os.fsync(f.fileno())
+    finally:
+        f.close()
+
+
+def file_digest(filepath: str) -> str:
+    """计算文件内容哈希，优先使用上传时已计算的结果"""
+    key = _file_key(filepath)
+    with _analyze_cache_lock:
+        digest = _upload_digests.get(key)
+    if digest is not None:
+        return digest
+    
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(_COPY_BUFFER_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
 def save_uploaded_file(file) -> Optional[str]:
-    """保存上传的文件"""
+    """
+    保存上传的文件
+    
+    以1MB为单位写入，同时计算内容哈希供 /analyze 的结果缓存使用；
+    落盘（fsync）在后台线程中完成，不阻塞请求。
+    """
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
         # 添加时间戳避免文件名冲突
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"{timestamp}_{filename}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        
+        hasher = hashlib.blake2b(digest_size=16)
+        dst = open(filepath, 'wb', buffering=_COPY_BUFFER_SIZE)
+        try:
+            for chunk in iter(lambda: file.stream.read(_COPY_BUFFER_SIZE), b''):
+                hasher.update(chunk)
+                dst.write(chunk)
+            dst.flush()
+        except BaseException:
+            dst.close()
+            raise
+        
+        # 数据已写入系统缓冲区，其他请求可以立即读取；落盘交给后台线程
+        IO_POOL.submit(_fsync_and_close, dst)
+        
+        with _analyze_cache_lock:
+            _upload_digests[_file_key(filepath)] = hasher.hexdigest()
+            if len(_upload_digests) > _ANALYZE_CACHE_SIZE:
+                _upload_digests.popitem(last=False)
+        
         return filepath
     return None
 
@@ -139,7 +334,7 @@ def upload():
             'success': True,
             'filepath': relative_path,
             'filename': os.path.basename(filepath),
-            'url': f"/images/uploads/{os.path.basename(filepath)}"
+            'url': upload_url(os.path.basename(filepath))
         })
     
     except RequestEntityTooLarge:
@@ -155,6 +350,171 @@ def upload():
         }), 500
 
 
+class ColorExtractionError(Exception):
+    """主色调提取失败"""
+
+
+def _model_identity() -> Optional[str]:
+    """当前款式识别模型的标识（未加载模型时为None），作为缓存键的一部分"""
+    return style_recognizer.model_path if style_recognizer is not None else None
+
+
+def _analysis_cache_key(filepath: str, styles: Dict[str, Any], context: Dict[str, Any]) -> tuple:
+    """
+    分析结果的缓存键
+    
+    结果还取决于文件名、请求中的款式和场景，以及是否加载了款式识别模型；
+    模型标识放在最后一项，模型加载后未带模型的结果不再命中。
+    """
+    return (
+        file_digest(filepath),
+        os.path.basename(filepath),
+        json.dumps(styles, sort_keys=True, ensure_ascii=False),
+        json.dumps(context, sort_keys=True, ensure_ascii=False),
+        _model_identity()
+    )
+
+
+def _with_current_model(cache_key: tuple) -> tuple:
+    """init_models 之后按当前模型更新缓存键的模型标识"""
+    return cache_key[:-1] + (_model_identity(),)
+
+
+def _get_cached_analysis(cache_key: tuple) -> Optional[Dict[str, Any]]:
+    """查询分析结果缓存，未命中返回None"""
+    with _analyze_cache_lock:
+        cached = _analyze_cache.get(cache_key)
+        if cached is not None:
+            _analyze_cache.move_to_end(cache_key)
+    return cached
+
+
+def _put_cached_analysis(cache_key: tuple, result: Dict[str, Any]) -> None:
+    """写入分析结果缓存"""
+    with _analyze_cache_lock:
+        _analyze_cache[cache_key] = result
+        if len(_analyze_cache) > _ANALYZE_CACHE_SIZE:
+            _analyze_cache.popitem(last=False)
+
+
+def _is_complete_analysis(result: Dict[str, Any], styles: Dict[str, Any]) -> bool:
+    """
+    判断分析结果是否可以缓存
+    
+    未加载模型时的结果按缓存键中的模型标识区分，可以缓存；
+    规则评估失败，或已加载模型但款式识别失败的结果不缓存，下次重新分析。
+    """
+    if result.get('rule_evaluation') is None:
+        return False
+    return bool(styles) or style_recognizer is None or bool(result.get('style_predictions'))
+
+
+def analyze_image(filepath: str,
+                  styles: Dict[str, Any],
+                  context: Dict[str, Any],
+                  style_predictions: Optional[list] = None) -> Dict[str, Any]:
+    """
+    分析单张图片（颜色提取、款式识别、颜色搭配评估和规则评估）
+    
+    参数:
+        filepath: 图片绝对路径
+        styles: 用户提供的款式，为空时使用模型识别
+        context: 场景信息
+        style_predictions: 已经算好的款式识别结果（批量识别时传入），为None时按需调用模型
+    
+    返回:
+        Dict[str, Any]: 分析结果（不含时间戳）
+    
+    异常:
+        ColorExtractionError: 主色调提取失败
+    """
+    from src.core.color_analyzer import (
+        extract_palette,
+        classify_color_types_batch,
+        evaluate_color_combo
+    )
+    
+    # 1. 提取主色调
+    try:
+        palette = extract_palette(filepath, n_colors=5)
+        # 转换为Python原生int类型的元组
+        colors = [tuple(rgb) for rgb in palette.colors.tolist()]
+        
+        # 所有颜色一次批量分类
+        color_infos = classify_color_types_batch(palette.colors)
+        colors_with_percent = [
+            {
+                'rgb': list(color),
+                'percentage': round(percentage, 2),
+                'name': color_info['name'],
+                'tone': color_info['tone']
+            }
+            for color, percentage, color_info in zip(
+                colors, palette.percentages.tolist(), color_infos
+            )
+        ]
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise ColorExtractionError(f'颜色提取失败: {str(e)}') from e
+    
+    # 2. 识别款式（优先使用用户提供的款式，其次使用模型识别）
+    if styles:
+        style_predictions = []
+    else:
+        # 如果用户没有提供款式，尝试使用模型识别
+        if style_predictions is None and style_recognizer:
+            try:
+                style_predictions = style_recognizer.predict(filepath, top_k=3)
+            except Exception as e:
+                print(f"款式识别失败: {e}")
+        style_predictions = style_predictions or []
+        if style_predictions:
+            top_class = style_predictions[0]['class']
+            styles = {
+                'top': top_class if 'top' in filepath.lower() else None,
+                'bottom': top_class if 'bottom' in filepath.lower() else None,
+                'shoes': top_class if 'shoes' in filepath.lower() else None,
+            }
+    
+    # 3. 颜色搭配评估（直接传入调色板，避免再次转换为数组）
+    color_evaluation = evaluate_color_combo(palette)
+    
+    # 4. 规则评估
+    rule_result = None
+    if rule_evaluator:
+        try:
+            rule_result = rule_evaluator.evaluate_outfit(
+                colors=colors,
+                styles=styles if styles else None,
+                context=context if context else None
+            )
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            print(f"规则评估失败: {e}")
+    
+    # 构建返回结果
+    return {
+        'success': True,
+        'image_url': upload_url(os.path.basename(filepath)),
+        'colors': colors_with_percent,
+        'color_evaluation': {
+            'score': color_evaluation['score'],
+            'suggestions': color_evaluation['suggestions']
+        },
+        'style_predictions': style_predictions,
+        'rule_evaluation': rule_result
+    }
+
+
+def _resolve_filepath(filepath: str) -> str:
+    """将请求中的相对路径转换为绝对路径"""
+    if not os.path.isabs(filepath):
+        filepath = os.path.join(BASE_DIR, filepath)
+    return filepath
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """分析穿搭"""
@@ -174,8 +534,7 @@ def analyze():
             }), 400
         
         # 转换为绝对路径
-        if not os.path.isabs(filepath):
-            filepath = os.path.join(BASE_DIR, filepath)
+        filepath = _resolve_filepath(filepath)
         
         # 检查文件是否存在
         if not os.path.exists(filepath):
@@ -184,92 +543,112 @@ def analyze():
                 'error': '文件不存在'
             }), 404
         
-        # 初始化模型
-        init_models()
+        styles = data.get('styles', {}) or {}  # 获取用户提供的款式
+        context = data.get('context', {})
         
-        # 1. 提取主色调
-        try:
-            colors_data = extract_dominant_colors(filepath, n_colors=5)
-            colors = [color for color, _ in colors_data]
-            colors_with_percent = []
+        # 查询分析结果缓存
+        cache_key = _analysis_cache_key(filepath, styles, context)
+        result = _get_cached_analysis(cache_key)
+        if result is None:
+            # 初始化模型
+            init_models()
             
-            for color, percentage in colors_data:
-                # 确保color是Python原生int类型的元组
-                color_tuple = tuple(int(c) for c in color)
-                
-                color_info = classify_color_type(color_tuple)
-                colors_with_percent.append({
-                    'rgb': list(color_tuple),
-                    'percentage': round(float(percentage), 2),
-                    'name': color_info['name'],
-                    'tone': color_info['tone']
-                })
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
+            try:
+                result = analyze_image(filepath, styles, context)
+            except ColorExtractionError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 500
+            if _is_complete_analysis(result, styles):
+                _put_cached_analysis(_with_current_model(cache_key), result)
+        
+        return jsonify(dict(result, timestamp=datetime.now().isoformat()))
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'分析失败: {str(e)}'
+        }), 500
+
+
+@app.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """
+    批量分析多张图片
+    
+    请求体: {"filepaths": [...], "styles": {...}, "context": {...}}，styles和context对所有图片生效。
+    需要模型识别款式的图片拼成一个批次只调用一次模型，颜色分析和规则评估在线程池中并行执行。
+    """
+    try:
+        data = request.get_json()
+        if not data:
             return jsonify({
                 'success': False,
-                'error': f'颜色提取失败: {str(e)}'
-            }), 500
+                'error': '请求数据格式错误'
+            }), 400
         
-        # 2. 识别款式（优先使用用户提供的款式，其次使用模型识别）
-        styles = data.get('styles', {}) or {}  # 获取用户提供的款式
-        style_predictions = []
+        filepaths = data.get('filepaths')
+        if not filepaths or not isinstance(filepaths, list):
+            return jsonify({
+                'success': False,
+                'error': '缺少文件路径列表'
+            }), 400
         
-        # 如果用户没有提供款式，尝试使用模型识别
-        if not styles and style_recognizer:
-            try:
-                predictions = style_recognizer.predict(filepath, top_k=3)
-                style_predictions = predictions
-                if predictions:
-                    styles = {
-                        'top': predictions[0]['class'] if 'top' in filepath.lower() else None,
-                        'bottom': predictions[0]['class'] if 'bottom' in filepath.lower() else None,
-                        'shoes': predictions[0]['class'] if 'shoes' in filepath.lower() else None,
-                    }
-            except Exception as e:
-                print(f"款式识别失败: {e}")
+        styles = data.get('styles', {}) or {}
+        context = data.get('context', {})
         
-        # 3. 颜色搭配评估
-        color_evaluation = evaluate_color_combo(colors)
+        results: list = [None] * len(filepaths)
+        pending = []  # (序号, 绝对路径, 缓存键)
+        for i, filepath in enumerate(filepaths):
+            abs_path = _resolve_filepath(filepath) if isinstance(filepath, str) and filepath else None
+            if abs_path is None or not os.path.exists(abs_path):
+                results[i] = {'success': False, 'filepath': filepath, 'error': '文件不存在'}
+                continue
+            cache_key = _analysis_cache_key(abs_path, styles, context)
+            cached = _get_cached_analysis(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, abs_path, cache_key))
         
-        # 4. 规则评估
-        context = data.get('context', {})
-        rule_result = None
-        if rule_evaluator:
-            try:
-                # 确保colors是正确的格式
-                colors_for_eval = [tuple(c) if isinstance(c, (list, tuple)) else c for c in colors]
-                rule_result = rule_evaluator.evaluate_outfit(
-                    colors=colors_for_eval,
-                    styles=styles if styles else None,
-                    context=context if context else None
-                )
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                print(f"规则评估失败: {e}")
+        if pending:
+            init_models()
+            
+            # 未命中缓存的图片一次批量识别款式
+            predictions = [None] * len(pending)
+            if not styles and style_recognizer:
+                try:
+                    batch = style_recognizer.predict_batch([path for _, path, _ in pending], top_k=3)
+                    predictions = [item['predictions'] or [] for item in batch]
+                except Exception as e:
+                    print(f"款式识别失败: {e}")
+                    predictions = [[] for _ in pending]
+            
+            def run(item):
+                (i, abs_path, cache_key), style_predictions = item
+                try:
+                    result = analyze_image(abs_path, styles, context, style_predictions)
+                except Exception as e:
+                    return i, {'success': False, 'filepath': filepaths[i], 'error': str(e)}
+                if _is_complete_analysis(result, styles):
+                    _put_cached_analysis(_with_current_model(cache_key), result)
+                return i, result
+            
+            for i, result in ANALYZE_POOL.map(run, zip(pending, predictions)):
+                results[i] = result
         
-        # 构建返回结果
-        result = {
+        return jsonify({
             'success': True,
-            'image_url': f"/images/uploads/{os.path.basename(filepath)}",
-            'colors': colors_with_percent,
-            'color_evaluation': {
-                'score': color_evaluation['score'],
-                'suggestions': color_evaluation['suggestions']
-            },
-            'style_predictions': style_predictions,
-            'rule_evaluation': rule_result,
+            'results': results,
+            'count': len(results),
             'timestamp': datetime.now().isoformat()
-        }
-        
-        return jsonify(result)
+        })
     
     except Exception as e:
         return jsonify({
             'success': False,
-            'error': f'分析失败: {str(e)}'
+            'error': f'批量分析失败: {str(e)}'
         }), 500
 
 
@@ -279,73 +658,12 @@ def recommend():
     try:
         context_type = request.args.get('context', '休闲')
         
-        # 初始化评估器
-        init_models()
-        
-        # 根据场景类型提供推荐
-        context_recommendations = {
-            '正式场合': {
-                'colors': ['黑', '白', '灰', '深蓝', '深灰'],
-                'styles': {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
-                'tips': [
-                    '选择经典的黑白灰配色',
-                    '正装风格，避免过于花哨',
-                    '皮鞋是正式场合的最佳选择',
-                    '保持整体简洁大气'
-                ]
-            },
-            '商务': {
-                'colors': ['深蓝', '深灰', '白', '黑'],
-                'styles': {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
-                'tips': [
-                    '商务场合以稳重为主',
-                    '深色系更显专业',
-                    '保持整洁干净的形象',
-                    '避免过于鲜艳的颜色'
-                ]
-            },
-            '工作': {
-                'colors': ['白', '蓝', '灰', '黑'],
-                'styles': {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
-                'tips': [
-                    '工作场合要专业但不失活力',
-                    '可以选择一些亮色作为点缀',
-                    '舒适度也很重要',
-                    '选择透气性好的面料'
-                ]
-            },
-            '休闲': {
-                'colors': ['白', '蓝', '灰', '黑', '棕'],
-                'styles': {'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '运动鞋'},
-                'tips': [
-                    '休闲场合可以更自由',
-                    '选择舒适的单品',
-                    '颜色可以更丰富',
-                    '搭配要协调即可'
-                ]
-            },
-            '运动': {
-                'colors': ['黑', '白', '灰', '蓝', '红'],
-                'styles': {'top': 'T恤', 'bottom': '休闲裤', 'shoes': '运动鞋'},
-                'tips': [
-                    '运动场合以舒适为主',
-                    '选择透气性好的材质',
-                    '颜色可以更鲜艳',
-                    '运动鞋是必备单品'
-                ]
-            }
-        }
-        
         # 获取对应场景的推荐，如果不存在则使用休闲作为默认
-        rec = context_recommendations.get(context_type, context_recommendations['休闲'])
+        response = _RECOMMEND_RESPONSES.get(context_type)
+        if response is None:
+            response = dict(_RECOMMEND_RESPONSES['休闲'], context=context_type)
         
-        return jsonify({
-            'success': True,
-            'context': context_type,
-            'recommendations': rec.get('tips', []),
-            'color_suggestions': rec.get('colors', []),
-            'style_suggestions': rec.get('styles', {})
-        })
+        return jsonify(response)
     
     except Exception as e:
         return jsonify({
@@ -360,22 +678,27 @@ def wardrobe():
     try:
         # 获取上传目录中的所有图片
         upload_dir = app.config['UPLOAD_FOLDER']
-        images = []
+        entries = []
         
+        # scandir 在读取目录时一并返回文件类型，stat结果也会缓存在DirEntry中
         if os.path.exists(upload_dir):
-            for filename in os.listdir(upload_dir):
-                if allowed_file(filename):
-                    filepath = os.path.join(upload_dir, filename)
-                    file_stat = os.stat(filepath)
-                    images.append({
-                        'filename': filename,
-                        'url': f"/images/uploads/{filename}",
-                        'uploaded_at': datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                        'size': file_stat.st_size
-                    })
+            with os.scandir(upload_dir) as it:
+                for entry in it:
+                    if entry.is_file() and allowed_file(entry.name):
+                        file_stat = entry.stat()
+                        entries.append((file_stat.st_mtime, entry.name, file_stat.st_size))
         
-        # 按上传时间排序
-        images.sort(key=lambda x: x['uploaded_at'], reverse=True)
+        # 按上传时间排序（直接比较时间戳），排序后再格式化时间
+        entries.sort(key=lambda x: x[0], reverse=True)
+        images = [
+            {
+                'filename': filename,
+                'url': upload_url(filename),
+                'uploaded_at': datetime.fromtimestamp(mtime).isoformat(),
+                'size': size
+            }
+            for mtime, filename, size in entries
+        ]
         
         return jsonify({
             'success': True,
@@ -392,7 +715,9 @@ def wardrobe():
 
 @app.route('/images/uploads/<filename>')
 def uploaded_file(filename):
-    """提供上传的图片文件"""
+    """提供上传的图片文件（开发环境使用；生产环境应由nginx/CDN直接提供）"""
+    if not app.config['SERVE_UPLOADS']:
+        abort(404)
     return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
 
 
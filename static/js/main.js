@@ -438,7 +438,7 @@ function displayHistory(images) {
         `;
         
         item.addEventListener('click', function() {
-            currentFilepath = image.url.replace('/images/uploads/', 'static/images/uploads/');
+            currentFilepath = `static/images/uploads/${image.filename}`;
             
             // 更新上传区域
             const uploadArea = document.getElementById('uploadArea');
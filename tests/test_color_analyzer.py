@@ -7,13 +7,16 @@
 import sys
 import os
 
+import numpy as np
+
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.core.color_analyzer import (
     classify_color_type,
     evaluate_color_combo,
-    calculate_color_distance
+    calculate_color_distance,
+    pairwise_color_distances
 )
 
 
@@ -151,6 +154,30 @@ def test_calculate_color_distance():
     return failed == 0
 
 
+def test_pairwise_color_distances():
+    """测试两两颜色距离矩阵"""
+    print("\n" + "=" * 60)
+    print("测试4: 两两颜色距离矩阵")
+    print("=" * 60)
+    
+    colors = [(0, 0, 0), (255, 255, 255), (255, 0, 0), (100, 100, 100)]
+    distances = pairwise_color_distances(colors)
+    
+    expected = np.array([
+        [calculate_color_distance(color1, color2) for color2 in colors]
+        for color1 in colors
+    ])
+    
+    assert distances.dtype == np.float32, f"距离矩阵应为float32，实际为 {distances.dtype}"
+    np.testing.assert_allclose(distances, expected, rtol=1e-5, atol=1e-3)
+    
+    # float64结果与逐对计算一致（evaluate_color_combo 对外返回的对比度使用float64）
+    distances64 = pairwise_color_distances(colors, dtype=np.float64)
+    assert distances64.dtype == np.float64
+    np.testing.assert_allclose(distances64, expected, rtol=1e-12)
+    print("✓ 距离矩阵与逐对计算结果一致")
+
+
 def main():
     """运行所有测试"""
     print("\n" + "=" * 60)
@@ -162,6 +189,14 @@ def main():
     results.append(("颜色搭配评估", test_evaluate_color_combo()))
     results.append(("颜色距离计算", test_calculate_color_distance()))
     
+    # 两两颜色距离测试使用assert，失败时抛出AssertionError
+    try:
+        test_pairwise_color_distances()
+        results.append(("两两颜色距离", True))
+    except AssertionError as e:
+        print(f"  ✗ 失败: {e}")
+        results.append(("两两颜色距离", False))
+    
     print("\n" + "=" * 60)
     print("测试总结")
     print("=" * 60)
@@ -181,6 +216,9 @@ def main():
 
 
 if __name__ == '__main__':
+    # 终端下stdout默认逐行刷新，测试输出很多行；改为块缓冲，退出时一次性写出
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
     main()
 
 
@@ -1,10 +1,16 @@
 """
 规则引擎单元测试
+
+使用pytest运行：python -m pytest tests/test_rule_engine.py
+（安装pytest-xdist后可加 -n auto 并行运行）
 """
 
 import sys
 import os
 
+import numpy as np
+import pytest
+
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -20,208 +26,296 @@ from src.core.rule_engine import (
 )
 
 
-def test_three_color_rule():
+CASUAL_STYLES = {'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '运动鞋'}
+
+
+# ==================== 共享的规则实例 ====================
+# 规则评估不修改规则本身，整个文件共用一个实例
+
+@pytest.fixture(scope='module')
+def three_color_rule():
+    return ThreeColorRule(max_colors=3)
+
+
+@pytest.fixture(scope='module')
+def forbidden_combo_rule():
+    return ForbiddenColorComboRule()
+
+
+@pytest.fixture(scope='module')
+def style_rule():
+    return StyleCoordinationRule()
+
+
+@pytest.fixture(scope='module')
+def context_rule():
+    return ContextAppropriateRule()
+
+
+@pytest.fixture
+def library():
+    """每个测试独立的规则库（测试会修改规则）"""
+    return RuleLibrary()
+
+
+# ==================== 单条规则 ====================
+
+@pytest.mark.parametrize('colors, expected', [
+    ([(255, 0, 0), (0, 0, 255), (255, 255, 255)], True),              # 红、蓝、白（白是中性色）
+    ([(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)], False),  # 4种主色
+])
+def test_three_color_rule(three_color_rule, colors, expected):
     """测试三色原则"""
-    print("=" * 60)
-    print("测试1: 三色原则")
-    print("=" * 60)
-    
-    rule = ThreeColorRule(max_colors=3)
-    
-    # 测试符合规则
-    result1 = rule.evaluate({
-        'colors': [(255, 0, 0), (0, 0, 255), (255, 255, 255)]  # 红、蓝、白（白是中性色）
-    })
-    print(f"测试1-1: 3种颜色（含中性色）")
-    print(f"  结果: {'通过' if result1.passed else '失败'}, 评分: {result1.score:.1f}")
-    print(f"  信息: {result1.message}")
-    assert result1.passed, "应该通过三色原则"
-    
-    # 测试违反规则
-    result2 = rule.evaluate({
-        'colors': [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]  # 4种主色
+    result = three_color_rule.evaluate({'colors': colors})
+    assert result.passed == expected, f"三色原则结果不符: {result.message}"
+
+
+@pytest.mark.parametrize('colors, expected', [
+    ([(255, 0, 0), (0, 255, 0)], False),  # 红绿组合应该检测为禁忌组合
+    ([(255, 0, 0), (0, 0, 255)], True),   # 红蓝组合应该通过
+])
+def test_forbidden_color_combo(forbidden_combo_rule, colors, expected):
+    """测试禁忌颜色组合"""
+    result = forbidden_combo_rule.evaluate({'colors': colors})
+    assert result.passed == expected, f"禁忌颜色组合结果不符: {result.message}"
+
+
+@pytest.mark.parametrize('styles', [
+    {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
+    CASUAL_STYLES,
+])
+def test_style_coordination(style_rule, styles):
+    """测试款式协调（正装配休闲裤属于部分混合，全休闲装协调统一，均应通过）"""
+    result = style_rule.evaluate({'styles': styles})
+    assert result.passed, f"款式应该协调: {result.message}"
+
+
+@pytest.mark.parametrize('context_type, expected', [
+    ('正式场合', False),  # 正式场合不应该穿休闲装
+    ('休闲', True),       # 休闲场合应该穿休闲装
+])
+def test_context_appropriate(context_rule, context_type, expected):
+    """测试场景适宜"""
+    result = context_rule.evaluate({
+        'context': {'type': context_type},
+        'styles': CASUAL_STYLES
     })
-    print(f"\n测试1-2: 4种主色")
-    print(f"  结果: {'通过' if result2.passed else '失败'}, 评分: {result2.score:.1f}")
-    print(f"  信息: {result2.message}")
-    assert not result2.passed, "应该违反三色原则"
+    assert result.passed == expected, f"场景适宜结果不符: {result.message}"
+
+
+# ==================== 规则评估器 ====================
+
+def test_rule_evaluator():
+    """测试规则评估器"""
+    result = RuleEvaluator().evaluate_outfit(
+        colors=[(255, 0, 0), (0, 255, 0)],  # 红绿（禁忌）
+        styles=CASUAL_STYLES,
+        context={'type': '休闲'}
+    )
     
-    print("✓ 三色原则测试通过\n")
+    for key in ('score', 'passed', 'results', 'suggestions', 'summary'):
+        assert key in result, f"评估结果缺少 {key}"
 
 
-def test_forbidden_color_combo():
-    """测试禁忌颜色组合"""
-    print("=" * 60)
-    print("测试2: 禁忌颜色组合")
-    print("=" * 60)
+@pytest.mark.parametrize('kwargs, expected', [
+    # 只提供颜色：款式和场景规则不参与评估
+    ({'colors': [(255, 255, 255), (0, 0, 0)]}, ['三色原则', '上浅下深原则', '禁忌颜色组合']),
+    # 只提供款式：只有款式规则参与评估
+    ({'styles': CASUAL_STYLES}, ['款式协调']),
+])
+def test_skip_rules_without_input(kwargs, expected):
+    """测试缺少输入数据的规则被跳过"""
+    result = RuleEvaluator().evaluate_outfit(**kwargs)
+    assert [r['rule_name'] for r in result['results']] == expected
+
+
+def test_configure_rule_updates_index():
+    """测试禁用规则后索引随之更新，且不影响共享默认规则库的其他评估器"""
+    colors = [(255, 255, 255), (0, 0, 0)]
     
-    rule = ForbiddenColorComboRule()
+    evaluator = RuleEvaluator()
+    evaluator.configure_rule('三色原则', enabled=False)
+    result = evaluator.evaluate_outfit(colors=colors)
+    assert '三色原则' not in [r['rule_name'] for r in result['results']]
     
-    # 测试红绿组合
-    result1 = rule.evaluate({
-        'colors': [(255, 0, 0), (0, 255, 0)]  # 红、绿
-    })
-    print(f"测试2-1: 红绿组合")
-    print(f"  结果: {'通过' if result1.passed else '失败'}, 评分: {result1.score:.1f}")
-    print(f"  信息: {result1.message}")
-    assert not result1.passed, "应该检测到红绿禁忌组合"
-    
-    # 测试正常组合
-    result2 = rule.evaluate({
-        'colors': [(255, 0, 0), (0, 0, 255)]  # 红、蓝
-    })
-    print(f"\n测试2-2: 红蓝组合")
-    print(f"  结果: {'通过' if result2.passed else '失败'}, 评分: {result2.score:.1f}")
-    print(f"  信息: {result2.message}")
-    assert result2.passed, "红蓝组合应该通过"
+    # 默认规则库在评估器间共享，修改只影响当前评估器
+    result = RuleEvaluator().evaluate_outfit(colors=colors)
+    assert '三色原则' in [r['rule_name'] for r in result['results']]
+
+
+def test_empty_outfit():
+    """测试空穿搭数据"""
+    result = RuleEvaluator().evaluate_outfit()
     
-    print("✓ 禁忌颜色组合测试通过\n")
+    assert result['score'] == 100.0
+    assert result['passed']
+    assert result['results'] == []
+    assert result['suggestions'] == []
+    assert result['summary'] == {
+        'total_rules': 0,
+        'passed_rules': 0,
+        'failed_rules': 0,
+        'errors': 0,
+        'warnings': 0
+    }
 
 
-def test_style_coordination():
-    """测试款式协调"""
-    print("=" * 60)
-    print("测试3: 款式协调")
-    print("=" * 60)
+@pytest.mark.parametrize('kwargs', [
+    {'top_colors': ['白']},
+    {'bottom_colors': ['黑']},
+])
+def test_no_applicable_rules(kwargs):
+    """测试有输入但没有规则参与评估时与空输入一致，记为100分"""
+    result = RuleEvaluator().evaluate_outfit(**kwargs)
     
-    rule = StyleCoordinationRule()
+    assert result['score'] == 100.0
+    assert result['passed']
+    assert result['results'] == []
+    assert result['summary']['total_rules'] == 0
+
+
+def test_rule_result_cache(library):
+    """测试规则评估结果缓存"""
+    evaluator = RuleEvaluator(library)
+    outfit = dict(
+        colors=[(255, 0, 0), (0, 255, 0)],
+        styles={'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '皮鞋'},
+        context={'type': '正式场合'}
+    )
     
-    # 测试正装协调
-    result1 = rule.evaluate({
-        'styles': {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'}
-    })
-    print(f"测试3-1: 衬衫+休闲裤+皮鞋")
-    print(f"  结果: {'通过' if result1.passed else '失败'}, 评分: {result1.score:.1f}")
-    print(f"  信息: {result1.message}")
+    # 重复评估同一套穿搭，结果不变
+    first = evaluator.evaluate_outfit(**outfit)
+    assert evaluator.evaluate_outfit(**outfit) == first
     
-    # 测试休闲装协调
-    result2 = rule.evaluate({
-        'styles': {'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '运动鞋'}
-    })
-    print(f"\n测试3-2: T恤+牛仔裤+运动鞋")
-    print(f"  结果: {'通过' if result2.passed else '失败'}, 评分: {result2.score:.1f}")
-    print(f"  信息: {result2.message}")
-    assert result2.passed, "休闲装应该协调"
+    # 修改规则权重后使用新权重，缓存的结果不受影响
+    evaluator.configure_rule('禁忌颜色组合', weight=3.0)
+    third = evaluator.evaluate_outfit(**outfit)
+    weights = {r['rule_name']: r['weight'] for r in third['results']}
+    assert weights['禁忌颜色组合'] == 3.0
+    assert third['score'] != first['score']
     
-    print("✓ 款式协调测试通过\n")
+    # 修改规则参数后缓存键随之变化
+    library.get_rule('三色原则').max_colors = 1
+    result = evaluator.evaluate_outfit(**outfit)
+    assert not {r['rule_name']: r['passed'] for r in result['results']}['三色原则']
 
 
-def test_context_appropriate():
-    """测试场景适宜"""
-    print("=" * 60)
-    print("测试4: 场景适宜")
-    print("=" * 60)
+BATCH_COLORS = [
+    [(255, 0, 0), (0, 255, 0)],                              # 红绿（禁忌）
+    [(255, 255, 255), (0, 0, 0), (100, 150, 200)],           # 白、黑、蓝
+    [(255, 0, 0), (0, 255, 0), (255, 255, 0), (0, 0, 255)],  # 4种主色
+    [],
+]
+BATCH_STYLES = [
+    CASUAL_STYLES,
+    {'top': '衬衫', 'bottom': '休闲裤', 'shoes': '皮鞋'},
+    None,
+    {'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '皮鞋'},
+]
+BATCH_CONTEXTS = [{'type': '休闲'}, {'type': '工作'}, {'type': '正式场合'}, None]
+
+
+def test_evaluate_outfit_batch(library):
+    """测试批量评分与逐套评分一致"""
+    evaluator = RuleEvaluator(library)
+    evaluator.configure_rule('禁忌颜色组合', weight=2.5)
     
-    rule = ContextAppropriateRule()
+    scores = evaluator.evaluate_outfit_batch(BATCH_COLORS, BATCH_STYLES, BATCH_CONTEXTS)
+    expected = [
+        evaluator.evaluate_outfit(colors, styles, context)['score']
+        for colors, styles, context in zip(BATCH_COLORS, BATCH_STYLES, BATCH_CONTEXTS)
+    ]
+    assert scores.tolist() == expected
     
-    # 测试正式场合
-    result1 = rule.evaluate({
-        'context': {'type': '正式场合'},
-        'styles': {'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '运动鞋'}
-    })
-    print(f"测试4-1: 正式场合穿休闲装")
-    print(f"  结果: {'通过' if result1.passed else '失败'}, 评分: {result1.score:.1f}")
-    print(f"  信息: {result1.message}")
-    assert not result1.passed, "正式场合不应该穿休闲装"
-    
-    # 测试休闲场合
-    result2 = rule.evaluate({
-        'context': {'type': '休闲'},
-        'styles': {'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '运动鞋'}
-    })
-    print(f"\n测试4-2: 休闲场合穿休闲装")
-    print(f"  结果: {'通过' if result2.passed else '失败'}, 评分: {result2.score:.1f}")
-    print(f"  信息: {result2.message}")
-    assert result2.passed, "休闲场合应该穿休闲装"
-    
-    print("✓ 场景适宜测试通过\n")
+    # 空输入与 evaluate_outfit 一致，记为100分
+    assert evaluator.evaluate_outfit_batch([[]]).tolist() == [100.0]
 
 
-def test_rule_evaluator():
-    """测试规则评估器"""
-    print("=" * 60)
-    print("测试5: 规则评估器")
-    print("=" * 60)
+def test_evaluate_batch(library):
+    """测试按字段编码的批量评分与逐套评分一致（包括有自定义规则时的回退路径）"""
+    from src.core.rule_engine_jit import encode_outfits
     
-    evaluator = RuleEvaluator()
+    colors = BATCH_COLORS[:3]
+    styles = BATCH_STYLES[:3]
+    contexts = BATCH_CONTEXTS[:3]
+    colors_arr = np.array([c[:2] for c in colors], dtype=np.uint8)
+    styles_arr, ctx_arr, styles_present, ctx_present = encode_outfits(styles, contexts)
+    assert styles_arr.shape == (3, 3) and ctx_arr.tolist()[2] != 0
     
-    # 测试完整评估
-    result = evaluator.evaluate_outfit(
-        colors=[(255, 0, 0), (0, 255, 0)],  # 红绿（禁忌）
-        styles={'top': 'T恤', 'bottom': '牛仔裤', 'shoes': '运动鞋'},
-        context={'type': '休闲'}
-    )
+    evaluator = RuleEvaluator(library)
+    expected = evaluator.evaluate_outfit_batch(colors_arr, styles, contexts)
+    assert evaluator.evaluate_batch(colors_arr, styles_arr, ctx_arr).tolist() == expected.tolist()
     
-    print(f"总体评分: {result['score']}")
-    print(f"是否通过: {result['passed']}")
-    print(f"通过规则: {result['summary']['passed_rules']}/{result['summary']['total_rules']}")
-    print(f"错误数: {result['summary']['errors']}, 警告数: {result['summary']['warnings']}")
+    # 两套同类规则时不走内核，结果仍一致
+    single_color = ThreeColorRule(max_colors=1)
+    single_color.name = '单色原则'
+    evaluator.add_custom_rule(single_color)
+    scores = evaluator.evaluate_batch(colors_arr, styles_arr, ctx_arr, styles_present, ctx_present)
+    expected = [
+        evaluator.evaluate_outfit([tuple(int(v) for v in rgb) for rgb in c], s, x)['score']
+        for c, s, x in zip(colors_arr, styles, contexts)
+    ]
+    assert scores.tolist() == expected
+
+
+@pytest.mark.parametrize('custom_rule', [False, True])
+def test_evaluate_batch_empty_values(library, custom_rule):
+    """测试只含空值的款式/场景字典仍算作提供了输入，与逐套评分一致"""
+    from src.core.rule_engine_jit import encode_outfits
     
-    assert 'score' in result
-    assert 'passed' in result
-    assert 'results' in result
-    assert 'suggestions' in result
-    assert 'summary' in result
+    colors_arr = np.array([[(255, 0, 0), (0, 255, 0)]] * 5, dtype=np.uint8)
+    styles = [{'top': ''}, {}, None, {'top': 'T恤', 'shoes': ''}, {'hat': '帽子'}]
+    contexts = [{'type': ''}, {'type': ''}, {'other': 1}, None, {}]
     
-    print("✓ 规则评估器测试通过\n")
+    evaluator = RuleEvaluator(library)
+    if custom_rule:
+        single_color = ThreeColorRule(max_colors=1)
+        single_color.name = '单色原则'
+        evaluator.add_custom_rule(single_color)
+    
+    scores = evaluator.evaluate_batch(colors_arr, *encode_outfits(styles, contexts))
+    expected = [
+        evaluator.evaluate_outfit([tuple(int(v) for v in rgb) for rgb in c], s, x)['score']
+        for c, s, x in zip(colors_arr, styles, contexts)
+    ]
+    assert scores.tolist() == expected
+
 
+# ==================== 规则库 ====================
 
-def test_rule_library():
+def test_rule_library(library):
     """测试规则库"""
-    print("=" * 60)
-    print("测试6: 规则库")
-    print("=" * 60)
+    # 禁用规则后重新启用
+    library.disable_rule('三色原则')
+    assert len(library.get_enabled_rules()) == len(library.rules) - 1
+    library.enable_rule('三色原则')
+    assert len(library.get_enabled_rules()) == len(library.rules)
     
-    library = RuleLibrary()
+    # 启用规则列表缓存到下次启停为止
+    assert library.get_enabled_rules() is library.get_enabled_rules()
     
-    print(f"默认规则数: {len(library.rules)}")
-    print("规则列表:")
-    for rule in library.rules:
-        print(f"  - {rule.name}: {rule.description} (权重: {rule.weight})")
+    # 按名称查找规则，规则名称不允许重复
+    assert library.get_rule('三色原则') is library.rules[0]
+    with pytest.raises(ValueError):
+        library.add_rule(ThreeColorRule())
     
-    # 测试禁用规则
-    library.disable_rule('三色原则')
-    enabled_rules = library.get_enabled_rules()
-    print(f"\n禁用'三色原则'后，启用规则数: {len(enabled_rules)}")
+    # 启停不存在的规则时报错，而不是静默忽略
+    with pytest.raises(KeyError):
+        library.disable_rule('三色原理')
     
-    # 测试启用规则
-    library.enable_rule('三色原则')
-    enabled_rules = library.get_enabled_rules()
-    print(f"重新启用'三色原则'后，启用规则数: {len(enabled_rules)}")
-    
-    assert len(enabled_rules) == len(library.rules)
-    
-    print("✓ 规则库测试通过\n")
-
-
-def main():
-    """运行所有测试"""
-    print("\n" + "=" * 60)
-    print("规则引擎单元测试")
-    print("=" * 60 + "\n")
-    
-    try:
-        test_three_color_rule()
-        test_forbidden_color_combo()
-        test_style_coordination()
-        test_context_appropriate()
-        test_rule_evaluator()
-        test_rule_library()
-        
-        print("=" * 60)
-        print("所有测试通过！")
-        print("=" * 60)
-        return True
-    except AssertionError as e:
-        print(f"\n测试失败: {e}")
-        return False
-    except Exception as e:
-        print(f"\n测试出错: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # 候选规则按输入键组合缓存，规则启停后重新筛选
+    color_keys = frozenset({'colors', 'top_colors', 'bottom_colors'})
+    candidates = library.candidate_rules(color_keys)
+    assert [r.name for r in candidates] == ['三色原则', '上浅下深原则', '禁忌颜色组合']
+    assert library.candidate_rules(color_keys) is candidates
+    library.disable_rule('上浅下深原则')
+    assert [r.name for r in library.candidate_rules(color_keys)] == ['三色原则', '禁忌颜色组合']
+    library.enable_rule('上浅下深原则')
+    
+    library.remove_rule('三色原则')
+    assert library.get_rule('三色原则') is None
+    assert len(library.rules) == 4
 
 
 if __name__ == '__main__':
-    main()
-
+    sys.exit(pytest.main([__file__, '-v']))
@@ -6,15 +6,56 @@
 
 import os
 import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 # 添加项目路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.core.train import train_model
 
+# 统计时计入的图片扩展名（集合查找，只比较一次后缀）
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png'})
 
-def main():
+
+def _count_images(class_dir: str) -> int:
+    """
+    统计类别目录中的图片数量
+    
+    使用os.scandir，文件类型随目录项一起返回，无需逐个stat；目录不存在时返回0。
+    """
+    try:
+        with os.scandir(class_dir) as entries:
+            return sum(1 for entry in entries
+                       if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS)
+    except FileNotFoundError:
+        return 0
+
+
+def _count_class(train_dir: str, validation_dir: str, cls: str) -> tuple:
+    """统计一个类别的训练和验证图片数量，返回 (类别, 训练数量, 验证数量)"""
+    return (cls,
+            _count_images(os.path.join(train_dir, cls)),
+            _count_images(os.path.join(validation_dir, cls)))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='简化的服装款式识别模型训练')
+    
+    parser.add_argument('-y', '--yes', action='store_true',
+                       help='跳过确认直接开始训练（也可设置环境变量 AUTO_CONFIRM=1）')
+    parser.add_argument('--epochs', type=int, default=30,
+                       help='训练轮数（默认: 30）')
+    parser.add_argument('--batch_size', type=int, default=32,
+                       help='批次大小（默认: 32）')
+    
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """简化的训练流程"""
+    args = parse_args(argv)
     
     print("=" * 70)
     print("欢迎使用服装款式识别模型训练工具")
@@ -54,8 +95,8 @@ def main():
         return
     
     # 检查是否有数据
-    train_classes = [d for d in os.listdir(train_dir) 
-                     if os.path.isdir(os.path.join(train_dir, d))]
+    with os.scandir(train_dir) as entries:
+        train_classes = [entry.name for entry in entries if entry.is_dir()]
     
     if not train_classes:
         print(f"\n❌ 错误: {train_dir} 中没有找到类别文件夹")
@@ -73,21 +114,15 @@ def main():
     total_train = 0
     total_val = 0
     
+    # 各类别目录的读取互不依赖，且读取目录时会释放GIL，用线程池并行统计
+    with ThreadPoolExecutor(max_workers=min(8, len(train_classes))) as executor:
+        counts = list(executor.map(partial(_count_class, train_dir, validation_dir), train_classes))
+    
     print("\n类别统计:")
-    for cls in train_classes:
-        train_path = os.path.join(train_dir, cls)
-        val_path = os.path.join(validation_dir, cls)
-        
-        train_count = len([f for f in os.listdir(train_path) 
-                          if f.lower().endswith(('.jpg', '.jpeg', '.png'))])
-        val_count = 0
-        if os.path.exists(val_path):
-            val_count = len([f for f in os.listdir(val_path) 
-                           if f.lower().endswith(('.jpg', '.jpeg', '.png'))])
-        
+    for cls, train_count, val_count in counts:
         total_train += train_count
         total_val += val_count
-        
+    
         print(f"  {cls:10s}: 训练 {train_count:3d} 张, 验证 {val_count:3d} 张")
     
     print(f"\n总计: 训练 {total_train} 张, 验证 {total_val} 张")
@@ -106,16 +141,22 @@ def main():
     print("=" * 70)
     
     print("\n使用默认配置:")
-    print("  - 训练轮数: 30 轮（快速训练）")
-    print("  - 批次大小: 32")
+    print(f"  - 训练轮数: {args.epochs} 轮")
+    print(f"  - 批次大小: {args.batch_size}")
     print("  - 学习率: 0.0001")
     print("  - 预计时间: 30-90分钟（取决于硬件）")
     
-    response = input("\n是否开始训练? (y/n): ").strip().lower()
+    if not (args.yes or os.getenv('AUTO_CONFIRM') == '1'):
+        # 非交互运行（脚本、CI）时无法确认，直接退出而不是一直等待输入
+        if not sys.stdin.isatty():
+            print("\n非交互模式下未确认，训练已取消（使用 -y 或 AUTO_CONFIRM=1 跳过确认）")
+            return
     
-    if response != 'y':
-        print("\n训练已取消")
-        return
+        response = input("\n是否开始训练? (y/n): ").strip().lower()
+    
+        if response != 'y':
+            print("\n训练已取消")
+            return
     
     # 开始训练
     print("\n" + "=" * 70)
@@ -127,36 +168,40 @@ def main():
     print("  - 训练曲线会保存到 models/training_history.png")
     print("\n")
     
+    # 到确认训练后才导入训练模块（会加载TensorFlow，冷启动需数秒），
+    # 数据目录缺失或取消训练时可以立即退出
+    from src.core.train import train_model
+    
     try:
         model, history = train_model(
             train_dir=train_dir,
             validation_dir=validation_dir,
             model_dir='models',
-            batch_size=32,
-            epochs=30,  # 快速训练，可以改为50或更多
+            batch_size=args.batch_size,
+            epochs=args.epochs,
             learning_rate=0.0001,
             fine_tune=False,  # 快速训练不微调，如需更高精度可改为True
             fine_tune_epochs=10,
             fine_tune_learning_rate=0.00001
         )
-        
+    
         print("\n" + "=" * 70)
         print("【训练完成】")
         print("=" * 70)
         print("\n✓ 模型已保存到: models/best_model.h5")
         print("✓ 训练曲线已保存到: models/training_history.png")
         print("✓ 训练日志已保存到: models/training_log.csv")
-        
+    
         print("\n下一步:")
         print("1. 查看训练曲线: models/training_history.png")
         print("2. 启动应用测试: python run.py")
         print("3. 访问 http://localhost:5000 上传图片测试效果")
-        
+    
         print("\n如果效果不理想，可以:")
         print("- 增加训练数据")
-        print("- 增加训练轮数（修改 train_easy.py 中的 epochs 参数）")
+        print("- 增加训练轮数（如 python train_easy.py --epochs 50）")
         print("- 启用微调（修改 train_easy.py 中的 fine_tune=True）")
-        
+    
     except KeyboardInterrupt:
         print("\n\n训练已被用户中断")
         print("部分训练的模型可能已保存到 models/ 目录")